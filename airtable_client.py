@@ -1,21 +1,35 @@
+import orjson
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from itertools import islice
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated calls reuse pooled keep-alive connections to Airtable
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_SESSION.headers.update({"Content-Type": "application/json"})
+_TIMEOUT = (5, 30)  # (connect, read) seconds
+
 
 def fetch_unscored(base_id: str, table_name: str, api_key: str, batch_size: int = 100) -> List[Dict]:
     url = f"https://api.airtable.com/v0/{base_id}/{table_name}"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    headers = {"Authorization": f"Bearer {api_key}"}
     params = {"filterByFormula": "AND({Relevance} = '', {Abstract} != '')",
               "fields": ["Patent ID", "Title", "Abstract", "Publication Date"],
               "maxRecords": batch_size,
               "sort": [{"field": "Patent ID", "direction": "asc"}]}
-    response = requests.get(url, headers=headers, params=params)
+    response = _SESSION.get(url, headers=headers, params=params, timeout=_TIMEOUT)
     response.raise_for_status()
-    data = response.json()
+    data = orjson.loads(response.content)
     records = data.get('records', [])
     batch_records = [{
         'id': record['id'],
@@ -30,14 +44,26 @@ def fetch_unscored(base_id: str, table_name: str, api_key: str, batch_size: int
 
 def update_record(base_id: str, table_name: str, api_key: str, record_id: str, relevance: str, subsystem: List[str]) -> None:
     url = f"https://api.airtable.com/v0/{base_id}/{table_name}/{record_id}"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    headers = {"Authorization": f"Bearer {api_key}"}
     data = {"fields": {"Relevance": relevance, "Subsystem": subsystem if subsystem else []}}
-    response = requests.patch(url, headers=headers, json=data)
+    response = _SESSION.patch(url, headers=headers, json=data, timeout=_TIMEOUT)
     response.raise_for_status()
 
 
+def update_records(base_id: str, table_name: str, api_key: str, updates: List[Tuple[str, str, List[str]]]) -> None:
+    """Apply (record_id, relevance, subsystem) updates 10 per request via the multi-record PATCH."""
+    url = f"https://api.airtable.com/v0/{base_id}/{table_name}"
+    headers = {"Authorization": f"Bearer {api_key}"}
+    it = iter(updates)
+    while batch := list(islice(it, 10)):
+        data = {"records": [{"id": record_id, "fields": {"Relevance": relevance, "Subsystem": subsystem if subsystem else []}}
+                            for record_id, relevance, subsystem in batch]}
+        response = _SESSION.patch(url, headers=headers, json=data, timeout=_TIMEOUT)
+        response.raise_for_status()
+
+
 def delete_record(base_id: str, table_name: str, api_key: str, record_id: str) -> None:
     url = f"https://api.airtable.com/v0/{base_id}/{table_name}/{record_id}"
     headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.delete(url, headers=headers)
+    response = _SESSION.delete(url, headers=headers, timeout=_TIMEOUT)
     response.raise_for_status()
@@ -1,15 +1,75 @@
-﻿import os
-from typing import Dict, List, Optional, Tuple, Union
+﻿import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
-import requests
+import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 
-load_dotenv()
+_AIRTABLE_ENV = ("AIRTABLE_API_KEY", "AIRTABLE_BASE_ID", "AIRTABLE_TABLE_NAME")
+if not all(os.getenv(name) for name in _AIRTABLE_ENV):
+    load_dotenv()  # Skip re-parsing .env when the process env is already complete
 
 AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
 AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
 AIRTABLE_TABLE_NAME = os.getenv("AIRTABLE_TABLE_NAME", "Patents")
 
+# Airtable allows 5 requests/second per base and answers bursts with a 30 s
+# lockout, so pace every call a little under the limit.
+AIRTABLE_RATE_LIMIT = float(os.getenv("AIRTABLE_RATE_LIMIT", "4.5"))
+AIRTABLE_BATCH_SIZE = 10  # Max records per multi-record create/update call
+
+
+class _RateLimiter:
+    """Thread-safe token bucket shared by concurrent Airtable workers."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token (possibly on credit) and return how long to wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # Reserving before the wait keeps callers in FIFO order without
+            # holding the lock while they sleep
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_rate_limiter = _RateLimiter(AIRTABLE_RATE_LIMIT)
+
+# Short-lived caches so UI paging/back-navigation doesn't refetch identical pages.
+# Pages are keyed by (filter_formula, offset token, page_size, maxRecords);
+# totals are (count, exact) keyed by filter_formula; exact is False when
+# _total_count stopped at its cap.
+_PAGE_CACHE: TTLCache = TTLCache(maxsize=512, ttl=30)
+_TOTAL_CACHE: TTLCache = TTLCache(maxsize=64, ttl=60)
+# Single records are served from memory for a minute; after that the last
+# ETag is sent back as If-None-Match so an unchanged record costs a bodiless 304.
+_RECORD_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_RECORD_ETAGS: LRUCache = LRUCache(maxsize=10_000)  # record_id -> (etag, record)
+_CACHE_LOCK = threading.Lock()
+
 
 def _base_headers() -> Dict[str, str]:
     return {
@@ -18,17 +78,248 @@ def _base_headers() -> Dict[str, str]:
     }
 
 
+# Process-wide HTTP/2 client: list GETs and concurrent PATCHes multiplex over
+# one pooled connection instead of each holding its own socket.
+_CLIENT = httpx.Client(
+    http2=True,
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=10),
+    headers=_base_headers(),
+)
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 5
+
+
+def _request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Issue a paced request on the shared client, backing off on 429/5xx."""
+    for attempt in range(_MAX_ATTEMPTS):
+        _rate_limiter.acquire()
+        resp = _CLIENT.request(method, url, **kwargs)
+        if resp.status_code not in _RETRY_STATUS or attempt == _MAX_ATTEMPTS - 1:
+            break
+        retry_after = resp.headers.get("Retry-After")
+        time.sleep(float(retry_after) if retry_after and retry_after.isdigit() else 0.5 * 2 ** attempt)
+    return resp
+
+
+def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    """_request, raising for error statuses."""
+    resp = _request(method, url, **kwargs)
+    if resp.status_code != 304:  # Not Modified answers a conditional GET
+        resp.raise_for_status()
+    return resp
+
+
+# Airtable field names, shared by readers and writers
+FIELD_PATENT_ID = "Patent ID"
+FIELD_TITLE = "Title"
+FIELD_ABSTRACT = "Abstract"
+FIELD_RELEVANCE = "Relevance"
+FIELD_SUBSYSTEM = "Subsystem"
+FIELD_PUB_DATE = "Publication Date"
+
+
 def _normalize_record(record: Dict) -> Dict:
-    fields = record.get("fields", {}) or {}
+    """
+    Flatten an Airtable record into API field names, coercing types once here
+    so readers get subsystem as a list of str and pub_date as a str.
+    """
+    get = (record.get("fields") or {}).get
+    subsystem = get(FIELD_SUBSYSTEM)
+    if isinstance(subsystem, list):
+        subsystem = [str(x) for x in subsystem if x is not None]
+    elif isinstance(subsystem, str):
+        subsystem = [subsystem]
+    else:
+        subsystem = []
+    pub_date = get(FIELD_PUB_DATE, "")
     return {
         "id": record.get("id", ""),
-        "patent_id": fields.get("Patent ID", ""),
-        "title": fields.get("Title", ""),
-        "abstract": fields.get("Abstract", ""),
-        "relevance": fields.get("Relevance"),
-        "subsystem": fields.get("Subsystem", []) or [],
-        "pub_date": fields.get("Publication Date", ""),
+        "patent_id": get(FIELD_PATENT_ID, ""),
+        "title": get(FIELD_TITLE, ""),
+        "abstract": get(FIELD_ABSTRACT, ""),
+        "relevance": get(FIELD_RELEVANCE),
+        "subsystem": subsystem,
+        "pub_date": str(pub_date) if pub_date is not None else "",
+    }
+
+
+def _require_config() -> None:
+    if not (AIRTABLE_API_KEY and AIRTABLE_BASE_ID and AIRTABLE_TABLE_NAME):
+        raise RuntimeError("Airtable environment variables not configured")
+
+
+def _table_url() -> str:
+    return f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{AIRTABLE_TABLE_NAME}"
+
+
+def _formula_string(value: str, quote: str = '"') -> str:
+    """Quote value as an Airtable formula string literal."""
+    return quote + value.replace("\\", "\\\\").replace(quote, "\\" + quote) + quote
+
+
+def _build_filter_formula(
+    q: Optional[str], relevance: Optional[str], subsystem: Optional[str]
+) -> Optional[str]:
+    # Cheapest predicates first so AND() can reject a record on the equality
+    # check before running the full-text SEARCH
+    formula_parts = []
+    if relevance:
+        formula_parts.append(f"{{Relevance}} = {_formula_string(relevance)}")
+    if subsystem:
+        formula_parts.append(f"FIND({_formula_string(subsystem)}, {{Subsystem}})")
+    if q:
+        # Search in Title and Abstract fields. Airtable's SEARCH is case-sensitive,
+        # so the fields are lowered server-side and the query is lowered here.
+        q_quoted = _formula_string(q.lower())
+        formula_parts.append(
+            f"OR(SEARCH({q_quoted}, LOWER({{Title}})), SEARCH({q_quoted}, LOWER({{Abstract}})))"
+        )
+
+    if not formula_parts:
+        return None
+    if len(formula_parts) == 1:
+        return formula_parts[0]
+    return "AND(" + ", ".join(formula_parts) + ")"
+
+
+_PAGE_SIZE = 95  # Below the 100 max to dodge Airtable's duplicate-overflow extra page
+_COUNT_HARD_CAP = 2000
+
+
+def _page_params(filter_formula: Optional[str], token: Optional[str], wanted: int) -> Dict[str, Union[str, int]]:
+    params: Dict[str, Union[str, int]] = {
+        "pageSize": _PAGE_SIZE,
+        "maxRecords": wanted,
+        "sort[0][field]": FIELD_PATENT_ID,
+        "sort[0][direction]": "asc",
     }
+    if filter_formula:
+        params["filterByFormula"] = filter_formula
+    if token:
+        params["offset"] = token
+    return params
+
+
+def _count_cap(wanted: int) -> int:
+    """Count cap for a window: always past the window, so a capped total never hides its next page."""
+    return max(_COUNT_HARD_CAP, wanted)
+
+
+def _count_params(filter_formula: Optional[str], hard_cap: int) -> Dict[str, Union[str, int]]:
+    params: Dict[str, Union[str, int]] = {
+        "pageSize": 100,
+        "maxRecords": hard_cap + 1,
+        "fields[]": FIELD_PATENT_ID,
+    }
+    if filter_formula:
+        params["filterByFormula"] = filter_formula
+    return params
+
+
+def _cached_page(cache_key: Tuple) -> Optional[Dict]:
+    with _CACHE_LOCK:
+        return _PAGE_CACHE.get(cache_key)
+
+
+def _store_page(cache_key: Tuple, content: bytes) -> Dict:
+    raw = orjson.loads(content)
+    # Keep only what paging reads so cached entries stay small
+    data = {"records": raw.get("records", []), "offset": raw.get("offset")}
+    with _CACHE_LOCK:
+        _PAGE_CACHE[cache_key] = data
+    return data
+
+
+def _cached_total(filter_formula: Optional[str], offset: int, limit: int) -> Optional[Tuple[int, bool]]:
+    """Cached (total, exact), unless it's a capped count that doesn't reach past this window."""
+    with _CACHE_LOCK:
+        cached = _TOTAL_CACHE.get(filter_formula)
+    if cached is None or not (cached[1] or cached[0] > offset + limit):
+        return None
+    return cached
+
+
+def _known_total(buffer: List[Dict], offset: int, limit: int, filter_formula: Optional[str]) -> Optional[Tuple[int, bool]]:
+    """(total, exact) for a filled buffer, or None when it still has to be counted."""
+    if len(buffer) > offset + limit:
+        return _cached_total(filter_formula, offset, limit)
+    # Buffer always starts at record 0, so reaching the end gives the exact total
+    return len(buffer), True
+
+
+def _remember_total(filter_formula: Optional[str], total: Tuple[int, bool]) -> None:
+    with _CACHE_LOCK:
+        _TOTAL_CACHE[filter_formula] = total
+
+
+def _cached_record(record_id: str) -> Optional[Dict]:
+    with _CACHE_LOCK:
+        return _RECORD_CACHE.get(record_id)
+
+
+def _known_etag(record_id: str) -> Optional[Tuple[str, Dict]]:
+    """The (etag, record) pair to revalidate with, taken once so a 304 can't outlive it."""
+    with _CACHE_LOCK:
+        return _RECORD_ETAGS.get(record_id)
+
+
+def _record_from_response(record_id: str, resp: httpx.Response, known: Optional[Tuple[str, Dict]]) -> Dict:
+    with _CACHE_LOCK:
+        if resp.status_code == 304:
+            # The record the If-None-Match was sent for, even if the entry was since dropped
+            record = known[1]
+        else:
+            record = _normalize_record(orjson.loads(resp.content))
+            etag = resp.headers.get("ETag")
+            if etag:
+                _RECORD_ETAGS[record_id] = (etag, record)
+        _RECORD_CACHE[record_id] = record
+    return record
+
+
+def forget_pages() -> None:
+    """Drop cached list pages and totals; any write can move records between filters."""
+    with _CACHE_LOCK:
+        _PAGE_CACHE.clear()
+        _TOTAL_CACHE.clear()
+
+
+def forget_record(record_id: str) -> None:
+    """Drop a record from the read caches after writing to it."""
+    with _CACHE_LOCK:
+        _RECORD_CACHE.pop(record_id, None)
+        _RECORD_ETAGS.pop(record_id, None)
+    forget_pages()
+
+
+_PATENT_ID_EQ = f"{{{FIELD_PATENT_ID}}}="
+
+
+def _existence_params(patent_ids: List[str]) -> Dict:
+    """Params for one OR() lookup of patent_ids, fetching only the Patent ID field."""
+    terms = ",".join([_PATENT_ID_EQ + _formula_string(pid, "'") for pid in patent_ids])
+    return {"pageSize": 100, "fields[]": FIELD_PATENT_ID, "filterByFormula": f"OR({terms})"}
+
+
+def _total_count(filter_formula: Optional[str], hard_cap: int = _COUNT_HARD_CAP) -> Tuple[int, bool]:
+    """
+    Count matching records with a Patent ID-only projection.
+
+    Airtable has no COUNT endpoint, so this pages through ids alone and stops
+    at hard_cap. Returns (count, exact); exact is False when the cap was hit.
+    """
+    url = _table_url()
+    params = _count_params(filter_formula, hard_cap)
+    count = 0
+    while True:
+        data = orjson.loads(_send("GET", url, params=params).content)
+        count += len(data.get("records", []))
+        token = data.get("offset")
+        if not token or count > hard_cap:
+            break
+        params["offset"] = token
+    return min(count, hard_cap), count <= hard_cap
 
 
 def fetch_records(
@@ -37,101 +328,378 @@ def fetch_records(
     q: Optional[str] = None,
     relevance: Optional[str] = None,
     subsystem: Optional[str] = None,
-) -> Tuple[List[Dict], int]:
+) -> Tuple[List[Dict], int, bool]:
     """
-    Fetch a window of records from Airtable with a real total count.
+    Fetch a window of records from Airtable.
+
+    Paging stops once the window is filled. When more records follow, the
+    total comes from a separate id-only count capped at 2000 (or just past
+    the window, if that's further), and total_exact is False when the cap
+    was hit: show the total as "2000+".
+
+    Pages are requested 95 records at a time (see _PAGE_SIZE), so a window
+    costs ceil((offset + limit + 1) / 95) page requests on a cold cache.
 
     Args:
-        limit: number of records to return
+        limit: number of records to return (records, not pages)
         offset: zero-based index into the full record list
         q: search query to filter title/abstract
         relevance: filter by relevance level (High, Medium, Low, etc.)
         subsystem: filter by subsystem
 
     Returns:
-        (records_window, total_count)
+        (records_window, total_count, total_exact)
     """
-    if not (AIRTABLE_API_KEY and AIRTABLE_BASE_ID and AIRTABLE_TABLE_NAME):
-        raise RuntimeError("Airtable environment variables not configured")
+    _require_config()
+    url = _table_url()
+    filter_formula = _build_filter_formula(q, relevance, subsystem)
 
-    url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{AIRTABLE_TABLE_NAME}"
-    headers = _base_headers()
+    buffer: List[Dict] = []
+    token: Optional[str] = None
+    # One record past the window tells us whether another page exists
+    wanted = offset + limit + 1
 
-    # Build filterByFormula
-    formula_parts = []
-    if q:
-        # Search in Title and Abstract fields
-        # Using SEARCH which is case-insensitive and returns position or ERROR
-        q_escaped = q.replace('"', '\\"')
-        formula_parts.append(
-            f"OR(SEARCH(LOWER(\"{q_escaped}\"), LOWER({{Title}})), SEARCH(LOWER(\"{q_escaped}\"), LOWER({{Abstract}})))"
+    while True:
+        cache_key = (filter_formula, token, _PAGE_SIZE, wanted)
+        data = _cached_page(cache_key)
+        if data is None:
+            resp = _send("GET", url, params=_page_params(filter_formula, token, wanted))
+            data = _store_page(cache_key, resp.content)
+
+        buffer.extend(_normalize_record(r) for r in data.get("records", []))
+
+        token = data.get("offset")
+        # Stop as soon as the window is filled; don't drain pages just to count
+        if not token or len(buffer) >= wanted:
+            break
+
+    total = _known_total(buffer, offset, limit, filter_formula)
+    if total is None:
+        total = _total_count(filter_formula, _count_cap(wanted))
+    _remember_total(filter_formula, total)
+    return (buffer[offset : offset + limit], *total)
+
+
+# --- Async variants for the FastAPI handlers ---------------------------------
+# Same requests, caches and retry policy as above, but awaitable so Airtable
+# round-trips don't hold the event loop. The client is created on first use
+# and closed from the app's lifespan via close_async_client().
+
+_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
+_ASYNC_SLOTS: Optional[asyncio.Semaphore] = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    global _ASYNC_CLIENT, _ASYNC_SLOTS
+    if _ASYNC_CLIENT is None or _ASYNC_CLIENT.is_closed:
+        # Concurrent requests are capped at Airtable's per-second budget
+        _ASYNC_SLOTS = asyncio.Semaphore(max(1, int(AIRTABLE_RATE_LIMIT)))
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            headers=_base_headers(),
         )
-    if relevance:
-        relevance_escaped = relevance.replace('"', '\\"')
-        formula_parts.append(f'{{Relevance}} = "{relevance_escaped}"')
-    if subsystem:
-        subsystem_escaped = subsystem.replace('"', '\\"')
-        formula_parts.append(f'FIND("{subsystem_escaped}", {{Subsystem}})')
+    return _ASYNC_CLIENT
 
-    filter_formula = None
-    if formula_parts:
-        if len(formula_parts) == 1:
-            filter_formula = formula_parts[0]
-        else:
-            filter_formula = "AND(" + ", ".join(formula_parts) + ")"
 
+async def close_async_client() -> None:
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+        _ASYNC_CLIENT = None
+
+
+async def _request_async(method: str, url: str, **kwargs) -> httpx.Response:
+    """Async counterpart of _request; shares the rate limiter with the sync client."""
+    client = get_async_client()
+    for attempt in range(_MAX_ATTEMPTS):
+        await _rate_limiter.acquire_async()
+        async with _ASYNC_SLOTS:
+            resp = await client.request(method, url, **kwargs)
+        if resp.status_code not in _RETRY_STATUS or attempt == _MAX_ATTEMPTS - 1:
+            break
+        retry_after = resp.headers.get("Retry-After")
+        await asyncio.sleep(float(retry_after) if retry_after and retry_after.isdigit() else 0.5 * 2 ** attempt)
+    return resp
+
+
+async def _send_async(method: str, url: str, **kwargs) -> httpx.Response:
+    """Async counterpart of _send."""
+    resp = await _request_async(method, url, **kwargs)
+    if resp.status_code != 304:
+        resp.raise_for_status()
+    return resp
+
+
+async def existing_patent_ids_async(patent_ids: List[str], chunk: int = AIRTABLE_BATCH_SIZE) -> Set[str]:
+    """
+    Return which of `patent_ids` already have an Airtable record.
+
+    Checks `chunk` ids per request with one OR() formula and a Patent ID-only
+    projection, and runs the chunk lookups concurrently.
+    """
+    _require_config()
+    url = _table_url()
+    unique = list(dict.fromkeys(patent_ids))
+
+    async def lookup(ids: List[str]) -> List[str]:
+        data = orjson.loads((await _send_async("GET", url, params=_existence_params(ids))).content)
+        return [(r.get("fields") or {}).get(FIELD_PATENT_ID, "") for r in data.get("records", [])]
+
+    found = await asyncio.gather(*(lookup(unique[i : i + chunk]) for i in range(0, len(unique), chunk)))
+    return {pid for ids in found for pid in ids}
+
+
+async def create_record_async(fields: Dict) -> httpx.Response:
+    """
+    Create one record. The response is returned unraised so callers can
+    report Airtable's validation errors (e.g. 422) per record.
+    """
+    _require_config()
+    resp = await _request_async("POST", _table_url(), json={"fields": fields})
+    if resp.is_success:
+        forget_pages()
+    return resp
+
+
+async def create_records_async(fields_list: List[Dict]) -> httpx.Response:
+    """
+    Create up to AIRTABLE_BATCH_SIZE records in one call. Airtable rejects the
+    whole batch if any record is invalid; the response is returned unraised.
+    """
+    _require_config()
+    resp = await _request_async(
+        "POST", _table_url(), json={"records": [{"fields": fields} for fields in fields_list]}
+    )
+    if resp.is_success:
+        forget_pages()
+    return resp
+
+
+async def fetch_record_async(record_id: str) -> Optional[Dict]:
+    """
+    Fetch one record by Airtable record ID over the shared async client.
+
+    Returns:
+        The normalized record, or None if Airtable has no such record.
+    """
+    _require_config()
+    record = _cached_record(record_id)
+    if record is not None:
+        return record
+    known = _known_etag(record_id)
+    headers = {"If-None-Match": known[0]} if known else {}
+    try:
+        resp = await _send_async("GET", f"{_table_url()}/{record_id}", headers=headers)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+    return _record_from_response(record_id, resp, known)
+
+
+async def _total_count_async(filter_formula: Optional[str], hard_cap: int = _COUNT_HARD_CAP) -> Tuple[int, bool]:
+    """Async counterpart of _total_count."""
+    url = _table_url()
+    params = _count_params(filter_formula, hard_cap)
+    count = 0
+    while True:
+        data = orjson.loads((await _send_async("GET", url, params=params)).content)
+        count += len(data.get("records", []))
+        token = data.get("offset")
+        if not token or count > hard_cap:
+            break
+        params["offset"] = token
+    return min(count, hard_cap), count <= hard_cap
+
+
+# Fetches currently in flight, so concurrent identical requests share one
+# Airtable call instead of each missing the cache. Only touched on the event loop.
+_INFLIGHT: Dict[Tuple, "asyncio.Future"] = {}
+
+
+async def _single_flight(key: Tuple, load: Callable[[], Awaitable]):
+    """Await load(), joining an identical call already in flight under key."""
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load())
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # shield: one waiter being cancelled mustn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def _page_async(url: str, filter_formula: Optional[str], token: Optional[str], wanted: int) -> Dict:
+    """One cached page, fetched at most once at a time per cache key."""
+    cache_key = (filter_formula, token, _PAGE_SIZE, wanted)
+    data = _cached_page(cache_key)
+    if data is not None:
+        return data
+
+    async def load() -> Dict:
+        resp = await _send_async("GET", url, params=_page_params(filter_formula, token, wanted))
+        return _store_page(cache_key, resp.content)
+
+    return await _single_flight(("page",) + cache_key, load)
+
+
+async def _fetch_window_async(url: str, filter_formula: Optional[str], wanted: int) -> List[Dict]:
+    """Page through Airtable until `wanted` records are buffered or the data ends."""
     buffer: List[Dict] = []
-    total_count = 0
     token: Optional[str] = None
-    page_size = 100  # Airtable max page size
-
     while True:
-        params: Dict[str, Union[str, int]] = {
-            "pageSize": page_size,
-            "sort[0][field]": "Patent ID",
-            "sort[0][direction]": "asc",
-        }
-        if filter_formula:
-            params["filterByFormula"] = filter_formula
-        if token:
-            params["offset"] = token
+        data = await _page_async(url, filter_formula, token, wanted)
 
-        resp = requests.get(url, headers=headers, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+        buffer.extend(_normalize_record(r) for r in data.get("records", []))
 
-        batch = [_normalize_record(r) for r in data.get("records", [])]
-        total_count += len(batch)
+        token = data.get("offset")
+        if not token or len(buffer) >= wanted:
+            return buffer
+
+
+async def iter_records_async(
+    limit: int = 25,
+    offset: int = 0,
+    q: Optional[str] = None,
+    relevance: Optional[str] = None,
+    subsystem: Optional[str] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Yield the records of a window one page at a time, without buffering the
+    whole window; used for streamed responses. No total is computed.
+    """
+    _require_config()
+    url = _table_url()
+    filter_formula = _build_filter_formula(q, relevance, subsystem)
+    wanted = offset + limit
+    if limit <= 0:
+        return
+
+    seen = 0
+    token: Optional[str] = None
+    while True:
+        data = await _page_async(url, filter_formula, token, wanted)
 
-        # Accumulate only until we have enough to slice the requested window
-        if len(buffer) < offset + limit:
-            need_more = (offset + limit) - len(buffer)
-            if need_more > 0:
-                buffer.extend(batch[:need_more])
+        for raw in data.get("records", []):
+            if seen >= offset:
+                yield _normalize_record(raw)
+            seen += 1
+            if seen >= wanted:
+                return
 
         token = data.get("offset")
         if not token:
-            break
+            return
+
+
+async def fetch_records_async(
+    limit: int = 25,
+    offset: int = 0,
+    q: Optional[str] = None,
+    relevance: Optional[str] = None,
+    subsystem: Optional[str] = None,
+) -> Tuple[List[Dict], int, bool]:
+    """
+    Async counterpart of fetch_records.
+
+    Window pages are chained by Airtable's offset token and must run in
+    order, but the id-only count doesn't depend on them; when no total is
+    cached for the filter, both run concurrently.
+    """
+    _require_config()
+    url = _table_url()
+    filter_formula = _build_filter_formula(q, relevance, subsystem)
+    wanted = offset + limit + 1
+
+    cached_total = _cached_total(filter_formula, offset, limit)
+    if cached_total is None:
+        cap = _count_cap(wanted)
+        buffer, counted = await asyncio.gather(
+            _fetch_window_async(url, filter_formula, wanted),
+            _single_flight(("count", filter_formula, cap), lambda: _total_count_async(filter_formula, cap)),
+        )
+    else:
+        buffer = await _fetch_window_async(url, filter_formula, wanted)
+
+    total = _known_total(buffer, offset, limit, filter_formula)
+    if total is None:
+        total = counted if cached_total is None else cached_total
+    _remember_total(filter_formula, total)
+    return (buffer[offset : offset + limit], *total)
 
-    window = buffer[offset : offset + limit]
-    return window, total_count
+
+def _score_fields(relevance: str, subsystem: List[str], score: int) -> Dict:
+    return {
+        FIELD_RELEVANCE: relevance,
+        FIELD_SUBSYSTEM: subsystem if subsystem else [],
+        "Score": score,
+    }
 
 
 def update_airtable_record(record_id: str, relevance: str, subsystem: List[str], score: int) -> None:
     """
     Update an Airtable record with scoring results.
     """
-    if not (AIRTABLE_API_KEY and AIRTABLE_BASE_ID and AIRTABLE_TABLE_NAME):
-        raise RuntimeError("Airtable environment variables not configured")
+    _require_config()
+    url = f"{_table_url()}/{record_id}"
+    _send("PATCH", url, json={"fields": _score_fields(relevance, subsystem, score)})
+    forget_record(record_id)
 
-    url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{AIRTABLE_TABLE_NAME}/{record_id}"
-    headers = _base_headers()
-    data = {
-        "fields": {
-            "Relevance": relevance,
-            "Subsystem": subsystem if subsystem else [],
-            "Score": score,
+
+def update_airtable_records_batch(
+    items: List[Tuple[str, str, List[str], int]],
+    chunk: int = AIRTABLE_BATCH_SIZE,
+) -> int:
+    """
+    Update records through Airtable's multi-record PATCH, `chunk` per request.
+
+    Args:
+        items: (record_id, relevance, subsystem, score) tuples
+        chunk: records per request (Airtable caps this at 10)
+
+    Returns:
+        Number of records updated.
+    """
+    _require_config()
+    url = _table_url()
+    it = iter(items)
+    updated = 0
+    while batch := list(islice(it, chunk)):
+        body = {
+            "records": [
+                {"id": record_id, "fields": _score_fields(relevance, subsystem, score)}
+                for record_id, relevance, subsystem, score in batch
+            ]
         }
-    }
-    response = requests.patch(url, headers=headers, json=data)
-    response.raise_for_status()
+        _send("PATCH", url, json=body)
+        for record_id, *_ in batch:
+            forget_record(record_id)
+        updated += len(batch)
+    return updated
+
+
+def update_airtable_records_bulk(
+    items: List[Tuple[str, str, List[str], int]],
+    max_workers: int = 8,
+) -> int:
+    """
+    Update many Airtable records concurrently, 10 records per PATCH.
+
+    Args:
+        items: (record_id, relevance, subsystem, score) tuples
+        max_workers: number of concurrent batch PATCH requests
+
+    Returns:
+        Number of records updated. The first failed update re-raises.
+    """
+    if not items:
+        return 0
+
+    chunks = [items[i : i + AIRTABLE_BATCH_SIZE] for i in range(0, len(items), AIRTABLE_BATCH_SIZE)]
+    if len(chunks) == 1:
+        return update_airtable_records_batch(chunks[0])
+
+    # _send paces every request through the shared rate limiter
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(update_airtable_records_batch, chunks))
@@ -3,7 +3,7 @@ Database configuration and session management using SQLAlchemy.
 """
 import os
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -17,13 +17,40 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "patent_scores.db"
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# Connection pool sizing; the API sizes its sync-handler threadpool to match (api.main lifespan)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+
 # Create engine with check_same_thread=False for SQLite (allows FastAPI to use it)
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    query_cache_size=1200,
     echo=False  # Set to True for SQL debug logging
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    """
+    Tune each new SQLite connection: WAL lets readers run alongside the ingest
+    writer, and synchronous=NORMAL avoids an fsync on every commit (safe under WAL).
+    """
+    cursor = dbapi_conn.cursor()
+    # Only takes effect while the file is still empty, so it must precede the
+    # WAL switch; existing databases keep their page size
+    cursor.execute("PRAGMA page_size=8192")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB memory-mapped I/O
+    cursor.close()
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -53,3 +80,61 @@ def init_db():
     """
     from api import models  # Import here to avoid circular imports
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        _migrate_search_id(conn, models)
+        # create_all skips indexes on tables that already exist; add any new ones
+        for mapped in Base.metadata.sorted_tables:
+            for index in mapped.indexes:
+                index.create(bind=conn, checkfirst=True)
+        for name in models.SUPERSEDED_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        fts_exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='scores_fts'"
+        ).first()
+        for ddl in models.SCORES_FTS_DDL:
+            conn.exec_driver_sql(ddl)
+        if not fts_exists:
+            # Index rows written before the search table existed (or was replaced)
+            conn.exec_driver_sql("INSERT INTO scores_fts(scores_fts) VALUES ('rebuild')")
+        _migrate_subsystem_json(conn)
+
+
+def _migrate_search_id(conn, models):
+    """
+    Add scores.search_id to databases created before it existed. The old
+    rowid-keyed search table and triggers go first, so filling search_id in
+    doesn't fire them; init_db then recreates and rebuilds the search table.
+    """
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(scores)")}
+    if "search_id" in columns:
+        return
+    for ddl in models.LEGACY_SCORES_FTS_DROPS:
+        conn.exec_driver_sql(ddl)
+    conn.exec_driver_sql("ALTER TABLE scores ADD COLUMN search_id INTEGER")
+    conn.exec_driver_sql("UPDATE scores SET search_id = rowid")
+
+
+def _migrate_subsystem_json(conn):
+    """
+    Rewrite subsystem_json values stored as Python reprs into JSON arrays, and
+    compact the rest, so equal subsystem lists are stored as equal text.
+    """
+    import ast
+
+    import orjson
+
+    rows = conn.exec_driver_sql(
+        "SELECT rowid, subsystem_json FROM scores "
+        "WHERE subsystem_json IS NOT NULL AND subsystem_json != '' AND NOT json_valid(subsystem_json)"
+    ).all()
+    for rowid, raw in rows:
+        try:
+            value = orjson.dumps(list(ast.literal_eval(raw))).decode()
+        except (ValueError, SyntaxError, TypeError):
+            value = "[]"
+        conn.exec_driver_sql("UPDATE scores SET subsystem_json = ? WHERE rowid = ?", (value, rowid))
+    # json() minifies exactly as orjson writes: no whitespace between items
+    conn.exec_driver_sql(
+        "UPDATE scores SET subsystem_json = json(subsystem_json) "
+        "WHERE json_valid(subsystem_json) AND subsystem_json != json(subsystem_json)"
+    )
@@ -6,7 +6,9 @@ import hashlib
 import csv
 import json
 import logging
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from xml.etree.ElementTree import iterparse
@@ -14,21 +16,50 @@ import gzip
 import zipfile
 import io
 
+# Prefer libxml2 for XML parsing; fall back to the stdlib parser if lxml is absent
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    etree = None
+    LXML_AVAILABLE = False
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from api.models import Score, QueueItem, IngestJob
 from api.db import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Max (patent_id, abstract_sha1) pairs per IN (...) lookup
+DEDUP_CHUNK_SIZE = 500
+# Parsed records deduplicated and committed per batch during ingest
+INGEST_BATCH_SIZE = 1000
+
+# Bulk queue insert; the (patent_id, abstract_sha1) PK drops already-queued rows
+_QUEUE_INSERT = sqlite_insert(QueueItem.__table__).on_conflict_do_nothing(
+    index_elements=['patent_id', 'abstract_sha1']
+)
+
 
 def compute_sha1(text: str) -> str:
     """Compute SHA1 hash of text."""
     return hashlib.sha1(text.encode('utf-8')).hexdigest()
 
 
+def compute_sha1_many(texts: List[str]) -> List[str]:
+    """Compute SHA1 hashes for a batch of texts (same digests as compute_sha1)."""
+    sha1 = hashlib.sha1
+    return [sha1(t.encode('utf-8')).hexdigest() for t in texts]
+
+
+@lru_cache(maxsize=512)
 def _strip_ns(tag: str) -> str:
-    """Remove XML namespace from tag."""
-    return tag.split('}', 1)[-1] if '}' in tag else tag
+    """Remove XML namespace from tag (memoized; USPTO documents use a few hundred tags)."""
+    if not isinstance(tag, str):
+        return ''  # lxml comments / processing instructions
+    i = tag.find('}')
+    return tag[i + 1:] if i >= 0 else tag
 
 
 def _text(elem) -> str:
@@ -53,25 +84,43 @@ def extract_record_from_xml(doc_elem) -> Optional[Dict]:
         is_grant = 'grant' in doc_tag.lower()
         source = "GRANT" if is_grant else "IPAB"
 
-        # Extract document number
-        pub_ref = doc_elem.find('.//{*}publication-reference/{*}document-id')
+        # Single walk over the document collecting the three sections we need;
+        # stops as soon as all are found so description/claims are never visited
+        pub_ref = None
+        title_elem = None
+        abstract_elem = None
+        for e in doc_elem.iter():
+            lt = _strip_ns(e.tag)
+            if lt == 'publication-reference' and pub_ref is None:
+                pub_ref = next(_iter_children(e, 'document-id'), None)
+            elif lt == 'invention-title' and title_elem is None:
+                title_elem = e
+            elif lt == 'abstract' and abstract_elem is None:
+                abstract_elem = e
+            if pub_ref is not None and title_elem is not None and abstract_elem is not None:
+                break
+        
         if pub_ref is None:
             return None
         
-        doc_num = _text(pub_ref.find('{*}doc-number'))
-        kind = _text(pub_ref.find('{*}kind'))
-        date = _text(pub_ref.find('{*}date'))
-        country = _text(pub_ref.find('{*}country'))
+        # Extract document number
+        ref = {}
+        for child in pub_ref:
+            lt = _strip_ns(child.tag)
+            if lt in ('doc-number', 'kind', 'date', 'country') and lt not in ref:
+                ref[lt] = _text(child)
+        doc_num = ref.get('doc-number', '')
+        kind = ref.get('kind', '')
+        date = ref.get('date', '')
+        country = ref.get('country', '')
         
         patent_id = f"{country}{doc_num}{kind}" if country and doc_num and kind else doc_num
         
         # Extract title
-        title_elem = doc_elem.find('.//{*}invention-title')
-        title = _text(title_elem) if title_elem is not None else ''
+        title = _text(title_elem)
         
         # Extract abstract
         abstract_parts = []
-        abstract_elem = doc_elem.find('.//{*}abstract')
         if abstract_elem is not None:
             for p in _iter_children(abstract_elem, 'p'):
                 abstract_parts.append(_text(p))
@@ -92,12 +141,15 @@ def extract_record_from_xml(doc_elem) -> Optional[Dict]:
         return None
 
 
-def parse_xml_stream(stream) -> List[Dict]:
+def iter_xml_stream(stream) -> Iterator[Dict]:
     """
     Parse USPTO XML stream and extract patent records.
-    Returns list of dicts with patent_id, title, abstract, pub_date, source.
+    Yields dicts with patent_id, title, abstract, pub_date, source.
     """
-    records = []
+    if LXML_AVAILABLE:
+        yield from _iter_xml_stream_lxml(stream)
+        return
+    
     try:
         context = iterparse(stream, events=('start', 'end'))
         _, root = next(context)
@@ -108,70 +160,108 @@ def parse_xml_stream(stream) -> List[Dict]:
                 if tag in ('us-patent-application', 'us-patent-grant'):
                     rec = extract_record_from_xml(elem)
                     if rec:
-                        records.append(rec)
+                        yield rec
                     elem.clear()
                     root.clear()
     except Exception as e:
         logger.error(f"XML parsing error: {e}")
-    
-    return records
 
 
-def parse_csv_stream(stream) -> List[Dict]:
+def _iter_xml_stream_lxml(stream) -> Iterator[Dict]:
+    """
+    lxml variant of iter_xml_stream: libxml2 filters the two document-level
+    tags in C so Python only sees one event per patent document.
+    """
+    try:
+        context = etree.iterparse(
+            stream,
+            events=('end',),
+            tag=('{*}us-patent-grant', '{*}us-patent-application'),
+            huge_tree=True,
+        )
+        for _, elem in context:
+            rec = extract_record_from_xml(elem)
+            if rec:
+                yield rec
+            # Free the finished document and any already-processed siblings
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    except Exception as e:
+        logger.error(f"XML parsing error: {e}")
+
+
+# Normalized CSV header names accepted for each logical field, in priority order
+CSV_COLUMN_ALIASES = {
+    'patent_id': ('patent_id', 'patentid', 'document_id', 'doc_number', 'publication_number'),
+    'title': ('title', 'invention_title'),
+    # Abstract might be in Notes field for USPTO exports
+    'abstract': ('abstract', 'notes', 'summary'),
+    'pub_date': ('pub_date', 'pubdate', 'date_published', 'date', 'filing_date'),
+    'source': ('source',),
+}
+
+
+def _normalize_csv_header(name: str) -> str:
+    """Normalize a CSV column name (strip BOM, snake_case separators)."""
+    return name.strip().lstrip('\ufeff').lower().replace(' ', '_').replace('/', '_').replace('-', '_')
+
+
+def _csv_column_index(header: List[str]) -> Dict[str, List[int]]:
+    """
+    Resolve each logical field to the CSV column positions of its aliases.
+    When a normalized name repeats, the last column wins (as DictReader did).
+    """
+    positions = {}
+    for i, name in enumerate(header):
+        if name:  # Skip empty column names
+            positions[_normalize_csv_header(name)] = i
+    return {
+        field: [positions[a] for a in aliases if a in positions]
+        for field, aliases in CSV_COLUMN_ALIASES.items()
+    }
+
+
+def _first_value(row: List[str], indexes: List[int]) -> str:
+    """Return the first non-empty stripped value among the given columns."""
+    for i in indexes:
+        if i < len(row):
+            value = row[i].strip()
+            if value:
+                return value
+    return ''
+
+
+def iter_csv_stream(stream) -> Iterator[Dict]:
     """
     Parse CSV stream and extract patent records.
     Handles multiple CSV formats including USPTO export format.
     Expected columns: patent_id/Document ID, title/Title, abstract (various), pub_date/Date Published
+    
+    Column aliases are resolved once from the header; rows are then read by position.
     """
-    records = []
     try:
         # Read as text stream with UTF-8-sig to handle BOM
         text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig')
-        reader = csv.DictReader(text_stream)
+        reader = csv.reader(text_stream)
+        header = next(reader, None)
+        if not header:
+            return
+        
+        idx = _csv_column_index(header)
+        patent_id_cols = idx['patent_id']
+        title_cols = idx['title']
+        abstract_cols = idx['abstract']
+        pub_date_cols = idx['pub_date']
+        source_cols = idx['source']
         
         for row in reader:
-            # Normalize column names (handle snake_case and camelCase)
-            normalized = {}
-            for k, v in row.items():
-                if k:  # Skip empty column names
-                    # Strip BOM and normalize
-                    key = k.strip().lstrip('\ufeff').lower().replace(' ', '_').replace('/', '_').replace('-', '_')
-                    normalized[key] = (v or '').strip()
-            
-            # Try multiple column name variations
-            patent_id = (
-                normalized.get('patent_id') or 
-                normalized.get('patentid') or 
-                normalized.get('document_id') or
-                normalized.get('doc_number') or
-                normalized.get('publication_number')
-            )
-            
-            title = (
-                normalized.get('title') or
-                normalized.get('invention_title') or
-                ''
-            )
-            
-            # Abstract might be in Title field if there's no separate abstract column
-            # Or in Notes field for USPTO exports
-            abstract = (
-                normalized.get('abstract') or
-                normalized.get('notes') or
-                normalized.get('summary') or
-                title  # Fallback to title if no abstract
-            )
-            
-            pub_date = (
-                normalized.get('pub_date') or 
-                normalized.get('pubdate') or 
-                normalized.get('date_published') or
-                normalized.get('date') or
-                normalized.get('filing_date') or
-                ''
-            )
-            
-            source = normalized.get('source', 'USPTO CSV')
+            patent_id = _first_value(row, patent_id_cols)
+            title = _first_value(row, title_cols)
+            # Fallback to title if no abstract
+            abstract = _first_value(row, abstract_cols) or title
+            pub_date = _first_value(row, pub_date_cols)
+            source = _first_value(row, source_cols) if source_cols else 'USPTO CSV'
             
             # Skip if we don't have minimum required fields
             if not patent_id:
@@ -185,54 +275,49 @@ def parse_csv_stream(stream) -> List[Dict]:
                     continue  # Skip records with no meaningful content
             
             if patent_id and abstract:
-                records.append({
+                yield {
                     'patent_id': patent_id,
                     'title': title,
                     'abstract': abstract,
                     'pub_date': pub_date,
                     'source': source
-                })
+                }
     except Exception as e:
         logger.error(f"CSV parsing error: {e}")
-    
-    return records
 
 
-def parse_file(file_path: str) -> List[Dict]:
+def iter_file(file_path: str) -> Iterator[Dict]:
     """
     Parse USPTO file (CSV, XML, XML.GZ, or ZIP containing XMLs).
-    Returns list of patent records.
+    Yields patent records one at a time so large files are never fully in memory.
     """
     path = Path(file_path)
-    records = []
     
     try:
         if path.suffix.lower() == '.csv':
             with open(path, 'rb') as f:
-                records = parse_csv_stream(f)
+                yield from iter_csv_stream(f)
         
         elif path.suffix.lower() == '.gz':
             with gzip.open(path, 'rb') as f:
-                records = parse_xml_stream(f)
+                yield from iter_xml_stream(f)
         
         elif path.suffix.lower() == '.zip':
             with zipfile.ZipFile(path, 'r') as zf:
                 for name in zf.namelist():
                     if name.lower().endswith('.xml'):
                         with zf.open(name) as f:
-                            records.extend(parse_xml_stream(f))
+                            yield from iter_xml_stream(f)
         
         elif path.suffix.lower() == '.xml':
             with open(path, 'rb') as f:
-                records = parse_xml_stream(f)
+                yield from iter_xml_stream(f)
         
         else:
             logger.error(f"Unsupported file type: {path.suffix}")
     
     except Exception as e:
         logger.error(f"File parsing error: {e}")
-    
-    return records
 
 
 def check_existing_score(db: Session, patent_id: str, abstract_sha1: str) -> Optional[Score]:
@@ -257,10 +342,84 @@ def check_existing_in_queue(db: Session, patent_id: str, abstract_sha1: str) ->
     ).first()
 
 
+def existing_keys(db: Session, model, keys: List[Tuple[str, str]]) -> set:
+    """
+    Return the subset of (patent_id, abstract_sha1) keys already stored for model.
+    Looks keys up in chunks of DEDUP_CHUNK_SIZE so each chunk is one SELECT.
+
+    Filters on patent_id alone so SQLite can seek the (patent_id, abstract_sha1)
+    primary-key index; a row-value IN (VALUES ...) makes it scan the whole index.
+    The exact pair match is done on the returned rows.
+    """
+    wanted = set(keys)
+    found = set()
+    patent_ids = list(dict.fromkeys(pid for pid, _ in keys))
+    for i in range(0, len(patent_ids), DEDUP_CHUNK_SIZE):
+        chunk = patent_ids[i:i + DEDUP_CHUNK_SIZE]
+        rows = db.query(model.patent_id, model.abstract_sha1).filter(
+            model.patent_id.in_(chunk)
+        ).all()
+        found.update((pid, sha1) for pid, sha1 in rows if (pid, sha1) in wanted)
+    return found
+
+
+def _enqueue_batch(db: Session, records: List[Dict]) -> Tuple[int, int, int]:
+    """
+    Deduplicate a batch of parsed records against scores, enqueue the rest and
+    commit. Queue dedup happens in SQLite via INSERT ... ON CONFLICT DO NOTHING.
+    Returns (existing_count, queued_count, new_count) for the batch.
+    """
+    existing_count = 0
+    
+    digests = compute_sha1_many([rec['abstract'] for rec in records])
+    keys = [(rec['patent_id'], digest) for rec, digest in zip(records, digests)]
+    scored_set = existing_keys(db, Score, keys)
+    new_rows: List[Dict] = []
+    
+    for rec, key in zip(records, keys):
+        if key in scored_set:
+            existing_count += 1
+            logger.debug(f"Skipping {rec['patent_id']} - already scored")
+            continue
+        
+        new_rows.append({
+            'patent_id': key[0],
+            'abstract_sha1': key[1],
+            'title': rec.get('title', ''),
+            'abstract': rec['abstract'],
+            'pub_date': rec.get('pub_date', ''),
+            'source': rec.get('source', 'UNKNOWN'),
+            'status': 'pending',
+        })
+    
+    new_count = 0
+    if new_rows:
+        # Rows already queued (or repeated within the batch) are skipped by the PK
+        result = db.execute(_QUEUE_INSERT, new_rows)
+        new_count = result.rowcount
+    db.commit()
+    return existing_count, len(new_rows) - new_count, new_count
+
+
+def _update_job(job_id: int, **fields) -> bool:
+    """Apply field updates to an ingest job in a short-lived session."""
+    with SessionLocal() as db:
+        job = db.get(IngestJob, job_id)
+        if not job:
+            return False
+        for name, value in fields.items():
+            setattr(job, name, value)
+        db.commit()
+        return True
+
+
 def process_ingest_job(job_id: int, file_path: str) -> Dict:
     """
     Process ingest job: parse file, deduplicate, prepare for scoring.
-    
+
+    Each batch gets its own short session, so the job never pins a pooled
+    connection (or an open read snapshot) while the file is being parsed.
+
     Returns:
         {
             'total_parsed': int,
@@ -269,24 +428,32 @@ def process_ingest_job(job_id: int, file_path: str) -> Dict:
             'error': Optional[str]
         }
     """
-    db = SessionLocal()
     try:
-        # Update job status
-        job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
-        if not job:
+        if not _update_job(job_id, status='running'):
             return {'error': 'Job not found'}
         
-        job.status = 'running'
-        db.commit()
-        
-        # Parse file
+        # Stream records and deduplicate/commit one batch at a time
         logger.info(f"Parsing file: {file_path}")
-        records = parse_file(file_path)
+        records = iter_file(file_path)
+        total_parsed = 0
+        existing_count = 0
+        queued_count = 0
+        new_count = 0
+        
+        while True:
+            batch = list(islice(records, INGEST_BATCH_SIZE))
+            if not batch:
+                break
+            total_parsed += len(batch)
+            with SessionLocal() as db:
+                existing, queued, new = _enqueue_batch(db, batch)
+            existing_count += existing
+            queued_count += queued
+            new_count += new
+            logger.info(f"Parsed {total_parsed} records so far")
         
-        if not records:
-            job.status = 'failed'
-            job.log = 'No records found in file'
-            db.commit()
+        if not total_parsed:
+            _update_job(job_id, status='failed', log='No records found in file')
             return {
                 'total_parsed': 0,
                 'existing_scores': 0,
@@ -294,59 +461,20 @@ def process_ingest_job(job_id: int, file_path: str) -> Dict:
                 'error': 'No records found'
             }
         
-        logger.info(f"Parsed {len(records)} records")
-        
-        # Deduplicate against master DB and queue
-        existing_count = 0
-        queued_count = 0
-        new_count = 0
-        
-        for rec in records:
-            abstract_sha1 = compute_sha1(rec['abstract'])
-            
-            # Check if already scored
-            existing = check_existing_score(db, rec['patent_id'], abstract_sha1)
-            
-            if existing:
-                existing_count += 1
-                logger.debug(f"Skipping {rec['patent_id']} - already scored")
-                continue
-            
-            # Check if already in queue
-            in_queue = check_existing_in_queue(db, rec['patent_id'], abstract_sha1)
-            
-            if in_queue:
-                queued_count += 1
-                logger.debug(f"Skipping {rec['patent_id']} - already in queue")
-                continue
-            
-            # Add to queue for scoring (it's new)
-            queue_item = QueueItem(
-                patent_id=rec['patent_id'],
-                abstract_sha1=abstract_sha1,
-                title=rec.get('title', ''),
-                abstract=rec['abstract'],
-                pub_date=rec.get('pub_date', ''),
-                source=rec.get('source', 'UNKNOWN'),
-                status='pending'
-            )
-            db.add(queue_item)
-            new_count += 1
-        
-        db.commit()
-        
         # Update job
-        job.status = 'completed'
-        job.matched_count = existing_count
-        job.enqueued_count = new_count
-        job.completed_at = datetime.now()
-        job.log = f"Parsed {len(records)}: {existing_count} already scored, {queued_count} already queued, {new_count} newly enqueued"
-        db.commit()
+        _update_job(
+            job_id,
+            status='completed',
+            matched_count=existing_count,
+            enqueued_count=new_count,
+            completed_at=datetime.now(),
+            log=f"Parsed {total_parsed}: {existing_count} already scored, {queued_count} already queued, {new_count} newly enqueued",
+        )
         
         logger.info(f"Ingest complete: {new_count} new, {existing_count} existing")
         
         return {
-            'total_parsed': len(records),
+            'total_parsed': total_parsed,
             'existing_scores': existing_count,
             'new_to_score': new_count,
             'error': None
@@ -354,16 +482,10 @@ def process_ingest_job(job_id: int, file_path: str) -> Dict:
     
     except Exception as e:
         logger.error(f"Ingest job {job_id} failed: {e}", exc_info=True)
-        job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
-        if job:
-            job.status = 'failed'
-            job.log = str(e)[:500]
-            db.commit()
+        _update_job(job_id, status='failed', log=str(e)[:500])
         return {
             'total_parsed': 0,
             'existing_scores': 0,
             'new_to_score': 0,
             'error': str(e)
         }
-    finally:
-        db.close()
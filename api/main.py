@@ -1,20 +1,32 @@
+import ast
+import asyncio
+import base64
+import hashlib
+import hmac
 import os
-from datetime import datetime
-from typing import List, Optional
+from datetime import timedelta
+from typing import List, Optional, Set, Tuple
 import tempfile
-import shutil
-import json
 import logging
 from pathlib import Path
-import urllib.parse
+from contextlib import asynccontextmanager
+from functools import lru_cache
 
+import orjson
+from anyio import to_thread
 from fastapi import Depends, FastAPI, Header, HTTPException, Security, UploadFile, File, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import Text, bindparam, delete, func, literal_column, or_, select, tuple_, type_coerce, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
 from api.schemas import (
+    BatchScoreRequest,
+    BatchScoreResponse,
     ErrorResponse,
     ListRecordsResponse,
     Provenance,
@@ -29,7 +41,11 @@ from api.schemas import (
     SettingsResponse,
     IngestJobResponse,
 )
-from api.db import get_db, init_db as init_database
+from api.db import DB_MAX_OVERFLOW, DB_POOL_SIZE, SessionLocal, get_db, init_db as init_database
+from api.utils.time import utcnow
+from api.models import AirtableSynced, IngestJob, QueueItem, Score, scores_fts
+from api.ingest_service import process_ingest_job
+from api.scoring_service import process_all_pending as process_all, process_queue_batch
 from api import airtable_service
 import scorer
 
@@ -44,15 +60,32 @@ if not logger.handlers:
 init_database()
 
 API_KEY = os.getenv("APP_API_KEY")
+_API_KEY_BYTES = API_KEY.encode() if API_KEY else None
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 PROMPT_VERSION = os.getenv("PROMPT_VERSION", "v1.0")
-AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID", "")
-AIRTABLE_TABLE_NAME = os.getenv("AIRTABLE_TABLE_NAME", "Patents")
+AIRTABLE_BASE_ID = airtable_service.AIRTABLE_BASE_ID or ""
+AIRTABLE_TABLE_NAME = airtable_service.AIRTABLE_TABLE_NAME
+# airtable_synced entries older than this are looked up again, since rows can
+# be deleted from Airtable (by hand or airtable_client.delete_record)
+AIRTABLE_SYNCED_TTL = timedelta(hours=float(os.getenv("AIRTABLE_SYNCED_TTL_HOURS", "24")))
+SKIP_CHUNK_SIZE = 500  # patent ids per UPDATE in /api/queue/skip
+UPLOAD_COPY_BUFFER = 1024 * 1024  # 1 MiB reads when spooling ingest uploads to disk
 
 # Security scheme for Swagger UI
 security = HTTPBearer()
 
-app = FastAPI(title="Patent Scoring API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync DB handlers run in anyio's threadpool (40 threads by default); size it
+    # to the connection pool so neither caps concurrency below the other
+    to_thread.current_default_thread_limiter().total_tokens = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    # Open the pooled async Airtable client up front; close it on shutdown
+    airtable_service.get_async_client()
+    yield
+    await airtable_service.close_async_client()
+
+
+app = FastAPI(title="Patent Scoring API", version="0.1.0", lifespan=lifespan)
 
 # Allow CORS for local dev
 app.add_middleware(
@@ -65,13 +98,45 @@ app.add_middleware(
 
 
 def get_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
-    if not API_KEY:
+    if not _API_KEY_BYTES:
         raise HTTPException(status_code=500, detail="Server misconfigured: APP_API_KEY not set.")
-    if credentials.credentials != API_KEY:
+    # Constant-time compare so response timing doesn't leak key prefixes
+    if not hmac.compare_digest(credentials.credentials.encode(), _API_KEY_BYTES):
         raise HTTPException(status_code=401, detail="Invalid API key")
     return credentials.credentials
 
 
+def _to_record_summary(rec: dict, schema=RecordSummary):
+    """
+    Map a normalized Airtable record (see airtable_service._normalize_record) onto a record schema.
+    _normalize_record already coerced the types, so validation is skipped.
+    """
+    return schema.model_construct(
+        id=rec["id"],
+        patent_id=rec["patent_id"],
+        abstract_sha1=None,
+        title=rec["title"],
+        abstract=rec["abstract"],
+        relevance=rec["relevance"],
+        score="0",  # Legacy convenience field (declared as a string)
+        subsystem=rec["subsystem"],
+        sha1="",
+        updated_at=rec["pub_date"],
+    )
+
+
+def _etag_response(payload, if_none_match: Optional[str]) -> Response:
+    """
+    Serialize payload once and tag it with a content hash; a client already
+    holding that exact body gets a bodiless 304 instead.
+    """
+    body = orjson.dumps(payload.model_dump(mode="json", by_alias=True))
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
 @app.get("/api/v1/records", response_model=ListRecordsResponse)
 async def list_records(
     limit: int = 25,
@@ -79,141 +144,139 @@ async def list_records(
     q: Optional[str] = None,
     relevance: Optional[str] = None,
     subsystem: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     api_key: str = Depends(get_api_key),
 ):
     try:
         # Fetch windowed records from Airtable with filters
-        records, total = airtable_service.fetch_records(limit=limit, offset=offset, q=q, relevance=relevance, subsystem=subsystem)
-        record_list: List[RecordSummary] = []
-        for rec in records:
-            raw_subsystem = rec.get("subsystem", [])
-            if raw_subsystem is None:
-                subsys: List[str] = []
-            elif isinstance(raw_subsystem, str):
-                subsys = [raw_subsystem]
-            elif isinstance(raw_subsystem, list):
-                subsys = [str(x) for x in raw_subsystem if x is not None]
-            else:
-                subsys = []
-
-            pub_date_val = rec.get("pub_date", "")
-            pub_date_str = str(pub_date_val) if pub_date_val is not None else ""
-
-            record_list.append(
-                RecordSummary(
-                    id=rec.get("id", ""),
-                    patent_id=rec.get("patent_id", ""),
-                    abstract_sha1=None,
-                    title=rec.get("title", ""),
-                    abstract=rec.get("abstract", ""),
-                    relevance=rec.get("relevance"),
-                    score=0,  # Legacy convenience field
-                    subsystem=subsys,
-                    sha1="",
-                    updated_at=pub_date_str,
-                )
-            )
-
-        return ListRecordsResponse(total=total, offset=offset, limit=limit, records=record_list)
+        records, total, total_exact = await airtable_service.fetch_records_async(limit=limit, offset=offset, q=q, relevance=relevance, subsystem=subsystem)
+        record_list = [_to_record_summary(rec) for rec in records]
+
+        return _etag_response(
+            ListRecordsResponse.model_construct(
+                total=total, total_capped=not total_exact, offset=offset, limit=limit, records=record_list
+            ),
+            if_none_match,
+        )
     except Exception as e:
-        import traceback
-        print("Error in list_records:", e)
-        traceback.print_exc()
+        logger.error(f"Error in list_records: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Airtable error: {str(e)}")
 
 
+@app.get("/api/v1/records.ndjson")
+async def stream_records(
+    limit: int = 25,
+    offset: int = 0,
+    q: Optional[str] = None,
+    relevance: Optional[str] = None,
+    subsystem: Optional[str] = None,
+    api_key: str = Depends(get_api_key),
+):
+    """Stream a records window as NDJSON, one RecordSummary per line, as pages arrive."""
+    if not (airtable_service.AIRTABLE_API_KEY and airtable_service.AIRTABLE_BASE_ID and airtable_service.AIRTABLE_TABLE_NAME):
+        raise HTTPException(status_code=500, detail="Airtable not configured")
+
+    async def lines():
+        async for rec in airtable_service.iter_records_async(
+            limit=limit, offset=offset, q=q, relevance=relevance, subsystem=subsystem
+        ):
+            yield orjson.dumps(_to_record_summary(rec).model_dump(by_alias=True)) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/api/v1/records/{record_id}", response_model=RecordDetail)
-async def get_record(record_id: str, api_key: str = Depends(get_api_key)):
+async def get_record(
+    record_id: str,
+    if_none_match: Optional[str] = Header(None),
+    api_key: str = Depends(get_api_key),
+):
     """Fetch a single record from Airtable by record ID."""
     try:
-        import requests
-        
         if not (airtable_service.AIRTABLE_API_KEY and airtable_service.AIRTABLE_BASE_ID and airtable_service.AIRTABLE_TABLE_NAME):
             raise HTTPException(status_code=500, detail="Airtable not configured")
         
-        url = f"https://api.airtable.com/v0/{airtable_service.AIRTABLE_BASE_ID}/{airtable_service.AIRTABLE_TABLE_NAME}/{record_id}"
-        headers = airtable_service._base_headers()
-        
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 404:
+        # Reuses the pooled keep-alive client shared with the list/update calls
+        normalized = await airtable_service.fetch_record_async(record_id)
+        if normalized is None:
             raise HTTPException(status_code=404, detail=f"Record {record_id} not found")
         
-        response.raise_for_status()
-        data = response.json()
-        
-        # Normalize the single record
-        normalized = airtable_service._normalize_record(data)
-        
-        # Convert to RecordDetail schema
-        raw_subsystem = normalized.get("subsystem", [])
-        if raw_subsystem is None:
-            subsys: List[str] = []
-        elif isinstance(raw_subsystem, str):
-            subsys = [raw_subsystem]
-        elif isinstance(raw_subsystem, list):
-            subsys = [str(x) for x in raw_subsystem if x is not None]
-        else:
-            subsys = []
-        
-        pub_date_val = normalized.get("pub_date", "")
-        pub_date_str = str(pub_date_val) if pub_date_val is not None else ""
-        
-        return RecordDetail(
-            id=normalized.get("id", ""),
-            patent_id=normalized.get("patent_id", ""),
-            abstract_sha1=None,
-            title=normalized.get("title", ""),
-            abstract=normalized.get("abstract", ""),
-            relevance=normalized.get("relevance"),
-            score=0,
-            subsystem=subsys,
-            sha1="",
-            updated_at=pub_date_str,
-        )
+        # Polling clients revalidate with If-None-Match; the record itself is
+        # served from airtable_service's TTL/ETag cache
+        return _etag_response(_to_record_summary(normalized, RecordDetail), if_none_match)
         
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"Error in get_record: {e}")
-        traceback.print_exc()
+        logger.error(f"Error in get_record: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching record: {str(e)}")
 
 
+def _to_score_response(result: dict, prov: Provenance) -> ScoreResponse:
+    # scorer.keyword_score reports capitalized keys
+    return ScoreResponse(
+        relevance=str(result.get("Relevance", "Low")),
+        score=int(result.get("score", 0)),
+        subsystem=list(result.get("Subsystem", [])),
+        sha1=str(result.get("sha1", "")),
+        provenance=prov,
+    )
+
+
 @app.post("/api/v1/score", response_model=ScoreResponse)
 async def score_record(req: ScoreRequest, api_key: str = Depends(get_api_key)):
     try:
         # Use keyword scorer for now; LLM integration to be added
-        result = scorer.keyword_score(title=req.title, abstract=req.abstract, mapping=req.mapping or {})
-        prov = Provenance(method=("keyword" if req.mode == "keyword" else "llm"), prompt_version=os.getenv("PROMPT_VERSION"), scored_at=datetime.utcnow())
-
-        return ScoreResponse(
-            relevance=str(result.get("relevance", "Low")),
-            score=int(result.get("score", 0)),
-            subsystem=list(result.get("subsystem", [])),
-            sha1=str(result.get("sha1", "")),
-            provenance=prov,
+        # Scoring is CPU work; keep it off the event loop
+        result = await run_in_threadpool(
+            scorer.keyword_score, title=req.title, abstract=req.abstract, mapping=req.mapping or {}
         )
+        prov = Provenance(method=("keyword" if req.mode == "keyword" else "llm"), prompt_version=PROMPT_VERSION, scored_at=utcnow())
+
+        return _to_score_response(result, prov)
     except Exception as e:
         print(f"Error in score_record: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Scoring error: {str(e)}")
 
 
+@app.post("/api/v1/score/batch", response_model=BatchScoreResponse)
+async def score_records_batch(req: BatchScoreRequest, api_key: str = Depends(get_api_key)):
+    """Score many patents in one call; the mapping is prepared once for the whole batch."""
+    try:
+        results = await run_in_threadpool(
+            scorer.keyword_score_many,
+            [item.title for item in req.items],
+            [item.abstract for item in req.items],
+            mapping=req.mapping or {},
+        )
+        # One provenance stamp covers the whole batch
+        prov = Provenance(method=("keyword" if req.mode == "keyword" else "llm"), prompt_version=PROMPT_VERSION, scored_at=utcnow())
+
+        return BatchScoreResponse(items=[_to_score_response(result, prov) for result in results])
+    except Exception as e:
+        logger.error(f"Error in score_records_batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Scoring error: {str(e)}")
+
+
+# Health and settings payloads depend only on process constants, so they are
+# serialized once here and served as-is
+_HEALTH_BYTES = orjson.dumps({"ok": True, "version": app.version})
+
+
 @app.get("/api/v1/health")
-def health():
-    return {"ok": True, "version": "0.1.0"}
+async def health():
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 
 # Compatibility aliases for health/settings to match potential frontend expectations
 @app.get("/health")
-def health_alias_root():
-    return {"ok": True, "version": "0.1.0"}
+async def health_alias_root():
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 
 @app.get("/api/health")
-def health_alias_api():
-    return {"ok": True, "version": "0.1.0"}
+async def health_alias_api():
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 
 @app.get("/api/stats")
@@ -222,12 +285,15 @@ def get_stats(
     api_key: str = Depends(get_api_key),
 ):
     """Get real-time counts for queue and scores."""
-    from api.models import QueueItem, Score
-    
-    pending_count = db.query(QueueItem).filter(QueueItem.status == "pending").count()
-    scored_in_queue = db.query(QueueItem).filter(QueueItem.status == "scored").count()
-    total_queue = db.query(QueueItem).count()
-    total_scores = db.query(Score).count()
+    # One round trip: the queue is scanned once, scores are counted alongside
+    pending_count, scored_in_queue, total_queue, total_scores = db.execute(
+        select(
+            func.count().filter(QueueItem.status == "pending"),
+            func.count().filter(QueueItem.status == "scored"),
+            func.count(),
+            select(func.count()).select_from(Score).scalar_subquery(),
+        ).select_from(QueueItem)
+    ).one()
     
     return {
         "queue": {
@@ -244,73 +310,288 @@ def get_stats(
 # --- New spec endpoints ---
 
 
-@app.get("/api/settings", response_model=SettingsResponse)
-async def get_settings():
-    return SettingsResponse(
+_SETTINGS_BYTES = orjson.dumps(
+    SettingsResponse(
         openaiModel=OPENAI_MODEL,
         promptVersion=PROMPT_VERSION,
         airtableBaseId=AIRTABLE_BASE_ID if AIRTABLE_BASE_ID else "not-set",
         airtableTableName=AIRTABLE_TABLE_NAME,
         adminApiKeySet=bool(API_KEY),
-    )
+    ).model_dump(by_alias=True)
+)
+
+
+@app.get("/api/settings", response_model=SettingsResponse)
+async def get_settings():
+    return Response(_SETTINGS_BYTES, media_type="application/json")
 
 
 # Alias without "/api" prefix for clients that call /settings
 @app.get("/settings", response_model=SettingsResponse)
 async def get_settings_alias():
-    return await get_settings()
+    return Response(_SETTINGS_BYTES, media_type="application/json")
+
+
+@lru_cache(maxsize=1024)
+def _parse_subsystems(raw: Optional[str]) -> Tuple[str, ...]:
+    """
+    Decode a stored subsystem_json value. Rows only hold a handful of
+    distinct subsystem combinations, so each is decoded once and reused.
+    """
+    if not raw:
+        return ()
+    try:
+        return tuple(orjson.loads(raw))
+    except ValueError:
+        pass
+    try:
+        # Repr-encoded rows are rewritten by init_db; tolerate any written since
+        return tuple(ast.literal_eval(raw))
+    except (ValueError, SyntaxError, TypeError):
+        logger.warning(f"Unreadable subsystem_json value: {raw[:80]!r}")
+        return ()
+
+
+def _encode_cursor(row) -> str:
+    """
+    Opaque keyset cursor: the last row's raw sort value and primary key. Not
+    rowid: scores and queue have no INTEGER PRIMARY KEY, so VACUUM may
+    renumber their rowids under cursors already handed out.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps([row.sort_key, row.patent_id, row.abstract_sha1])).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        sort_key, patent_id, abstract_sha1 = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not all(isinstance(value, str) for value in (sort_key, patent_id, abstract_sha1)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"after_key": sort_key, "after_patent_id": patent_id, "after_sha1": abstract_sha1}
+
+
+def _keyset_condition(model, sort_column: str):
+    """(sort_column, patent_id, abstract_sha1) strictly after the cursor row, in DESC order."""
+    return tuple_(
+        literal_column(f"{model.__tablename__}.{sort_column}"), model.patent_id, model.abstract_sha1
+    ) < tuple_(bindparam("after_key"), bindparam("after_patent_id"), bindparam("after_sha1"))
+
+
+def _keyset_order(model, sort_column: str):
+    # The filter indexes end at the sort column; ties are sorted on the fly
+    return (getattr(model, sort_column).desc(), model.patent_id.desc(), model.abstract_sha1.desc())
+
+
+@lru_cache(maxsize=None)
+def _score_list_statements(
+    has_relevance: bool, has_source: bool, search_mode: Optional[str], has_cursor: bool
+):
+    """
+    Build (page, count) statements for one /api/scores filter shape.
+
+    Inputs are bound parameters, so each of the few shapes is constructed
+    once and every request reuses its compiled SQL from the engine cache.
+    """
+
+    conditions = []
+    if has_relevance:
+        conditions.append(Score.relevance == bindparam("relevance"))
+    if has_source:
+        conditions.append(Score.source == bindparam("source"))
+    if search_mode == "fts":
+        # One FTS5 phrase: a trigram substring match over all three columns
+        conditions.append(
+            Score.search_id.in_(
+                select(scores_fts.c.rowid).where(literal_column("scores_fts").op("MATCH")(bindparam("q")))
+            )
+        )
+    elif search_mode == "like":
+        q = bindparam("q")
+        conditions.append(or_(Score.title.ilike(q), Score.abstract.ilike(q), Score.patent_id.ilike(q)))
+
+    # Plain column rows: no ORM identity map or instance state per item
+    columns = [
+        Score.patent_id,
+        Score.abstract_sha1,
+        Score.relevance,
+        Score.subsystem_json,
+        Score.title,
+        Score.abstract,
+        Score.pub_date,
+        Score.source,
+        Score.scored_at,
+        # Raw stored value: the keyset cursor compares it as-is
+        type_coerce(Score.scored_at, Text).label("sort_key"),
+    ]
+    page_stmt = (
+        select(*columns)
+        .where(*conditions, *([_keyset_condition(Score, "scored_at")] if has_cursor else []))
+        .order_by(*_keyset_order(Score, "scored_at"))
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    count_stmt = select(func.count()).select_from(Score).where(*conditions)
+    return page_stmt, count_stmt
+
+
+def _page_total(db: Session, rows, count_stmt, params: dict, offset_val: int, page_size: int, keyset: bool, skip_total: bool):
+    """
+    Total for a list page. Counted with its own statement, which the filter
+    indexes answer without touching the wide page columns; a count(*) OVER ()
+    window would have SQLite buffer every filtered row before the LIMIT.
+    """
+    if skip_total:
+        return None
+    if not keyset and len(rows) < page_size and (rows or not offset_val):
+        # A short offset page is the last one, so it already says how many match
+        return offset_val + len(rows)
+    return db.scalar(count_stmt, params)
+
+
+def _score_list_params(relevance, search, source, cursor, offset_val: int, page_size: int):
+    """Bind params and search mode shared by the /api/scores list and NDJSON routes."""
+    params = {"relevance": relevance, "source": source, "offset": offset_val, "limit": page_size}
+    if cursor:
+        params.update(_decode_cursor(cursor))
+    search_mode = None
+    if search and len(search) >= 3:
+        search_mode = "fts"
+        params["q"] = '"' + search.replace('"', '""') + '"'
+    elif search:
+        # Trigram index can't serve terms shorter than 3 characters
+        search_mode = "like"
+        params["q"] = f"%{search}%"
+    return params, search_mode
+
+
+def _to_score_list_item(item) -> ScoreListItem:
+    # Rows come straight from our own schema, so skip re-validating each item
+    return ScoreListItem.model_construct(
+        patent_id=item.patent_id,
+        abstract_sha1=item.abstract_sha1,
+        relevance=item.relevance or "Low",
+        subsystem=list(_parse_subsystems(item.subsystem_json)),
+        title=item.title,
+        abstract=item.abstract,
+        pub_date=item.pub_date,
+        source=item.source,
+        scored_at=item.scored_at.isoformat() if item.scored_at else "",
+    )
+
+
+def _score_row_json(row) -> bytes:
+    """One NDJSON line for a score row: the ScoreListItem wire shape, built without a model."""
+    patent_id, abstract_sha1, relevance, subsystem_json, title, abstract, pub_date, source, scored_at = row[:9]
+    return orjson.dumps({
+        "patentId": patent_id,
+        "abstractSha1": abstract_sha1,
+        "relevance": relevance or "Low",
+        "subsystem": list(_parse_subsystems(subsystem_json)),
+        "title": title,
+        "abstract": abstract,
+        "pubDate": pub_date,
+        "source": source,
+        "scoredAt": scored_at.isoformat() if scored_at else "",
+    }) + b"\n"
 
 
 @app.get("/api/scores", response_model=ScoresListResponse)
-async def list_scores(
+def list_scores(
     page: int = 1,
     page_size: int = 50,
     relevance: Optional[str] = None,
     search: Optional[str] = None,
     source: Optional[str] = None,
+    cursor: Optional[str] = None,
+    skip_total: bool = False,
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
-    from api.models import Score
-    from sqlalchemy import or_
-
-    query = db.query(Score)
-
-    if relevance:
-        query = query.filter(Score.relevance == relevance)
-    if source:
-        query = query.filter(Score.source == source)
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Score.title.ilike(search_term),
-                Score.abstract.ilike(search_term),
-                Score.patent_id.ilike(search_term),
-            )
-        )
+    """
+    List scored patents, newest first. Pass the previous response's nextCursor
+    as `cursor` to seek instead of paging by offset, and `skip_total=true` to
+    skip counting the matches.
+    """
+    offset_val = 0 if cursor else (page - 1) * page_size
+    params, search_mode = _score_list_params(relevance, search, source, cursor, offset_val, page_size)
+    page_stmt, count_stmt = _score_list_statements(bool(relevance), bool(source), search_mode, bool(cursor))
 
-    total = query.count()
+    rows = db.execute(page_stmt, params).all()
+    total = _page_total(db, rows, count_stmt, params, offset_val, page_size, bool(cursor), skip_total)
+    next_cursor = _encode_cursor(rows[-1]) if len(rows) == page_size else None
 
-    offset_val = (page - 1) * page_size
-    items_db = query.order_by(Score.scored_at.desc()).offset(offset_val).limit(page_size).all()
+    items = [_to_score_list_item(item) for item in rows]
 
-    items = [
-        ScoreListItem(
-            patentId=item.patent_id,
-            abstractSha1=item.abstract_sha1,
-            relevance=item.relevance or "Low",
-            subsystem=(eval(item.subsystem_json) if item.subsystem_json else []),
-            title=item.title,
-            abstract=item.abstract,
-            pubDate=item.pub_date,
-            source=item.source,
-            scoredAt=item.scored_at.isoformat() if item.scored_at else "",
-        )
-        for item in items_db
-    ]
+    return ScoresListResponse.model_construct(
+        items=items, page=page, page_size=page_size, total=total, next_cursor=next_cursor
+    )
+
+
+# Rows fetched from SQLite per round trip while streaming
+SCORE_STREAM_BATCH = 500
 
-    return ScoresListResponse(items=items, page=page, pageSize=page_size, total=total)
+
+@app.get("/api/scores.ndjson")
+def stream_scores(
+    page: int = 1,
+    page_size: int = 50,
+    relevance: Optional[str] = None,
+    search: Optional[str] = None,
+    source: Optional[str] = None,
+    cursor: Optional[str] = None,
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Stream the same page as /api/scores as NDJSON, one ScoreListItem per line,
+    without building the whole page in memory first. No total is computed.
+    """
+    offset_val = 0 if cursor else (page - 1) * page_size
+    params, search_mode = _score_list_params(relevance, search, source, cursor, offset_val, page_size)
+    page_stmt, _ = _score_list_statements(bool(relevance), bool(source), search_mode, bool(cursor))
+
+    # Starlette iterates a sync generator in the threadpool; the session lives
+    # as long as the stream rather than the request handler
+    def lines():
+        with SessionLocal() as db:
+            for row in db.execute(page_stmt, params).yield_per(SCORE_STREAM_BATCH):
+                yield _score_row_json(row)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@lru_cache(maxsize=None)
+def _queue_list_statements(has_status: bool, has_cursor: bool):
+    """Build (page, count) statements for /api/queue, with or without a status filter."""
+
+    conditions = [QueueItem.status == bindparam("status")] if has_status else []
+    columns = [
+        QueueItem.patent_id,
+        QueueItem.abstract_sha1,
+        QueueItem.title,
+        QueueItem.abstract,
+        QueueItem.pub_date,
+        QueueItem.source,
+        QueueItem.status,
+        QueueItem.enqueued_at,
+        Score.relevance,
+        type_coerce(QueueItem.enqueued_at, Text).label("sort_key"),
+    ]
+    # Join QueueItem with Score to get the relevance score if it exists
+    page_stmt = (
+        select(*columns)
+        .outerjoin(
+            Score,
+            (QueueItem.patent_id == Score.patent_id) &
+            (QueueItem.abstract_sha1 == Score.abstract_sha1)
+        )
+        .where(*conditions, *([_keyset_condition(QueueItem, "enqueued_at")] if has_cursor else []))
+        .order_by(*_keyset_order(QueueItem, "enqueued_at"))
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    count_stmt = select(func.count()).select_from(QueueItem).where(*conditions)
+    return page_stmt, count_stmt
 
 
 @app.get("/api/queue", response_model=QueueListResponse)
@@ -318,43 +599,40 @@ def get_queue(
     page: int = 1,
     page_size: int = 50,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    skip_total: bool = False,
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
-    from api.models import QueueItem, Score
+    """List queue items, newest first; `cursor`/`skip_total` work as on /api/scores."""
+    offset_val = 0 if cursor else (page - 1) * page_size
+    params = {"status": status, "offset": offset_val, "limit": page_size}
+    if cursor:
+        params.update(_decode_cursor(cursor))
+    page_stmt, count_stmt = _queue_list_statements(bool(status), bool(cursor))
 
-    # Join QueueItem with Score to get the relevance score if it exists
-    query = db.query(QueueItem, Score.relevance).outerjoin(
-        Score,
-        (QueueItem.patent_id == Score.patent_id) & 
-        (QueueItem.abstract_sha1 == Score.abstract_sha1)
-    )
-    
-    if status:
-        query = query.filter(QueueItem.status == status)
-
-    query = query.order_by(QueueItem.enqueued_at.desc())
-
-    total = query.count()
-    offset_val = (page - 1) * page_size
-    results = query.offset(offset_val).limit(page_size).all()
+    rows = db.execute(page_stmt, params).all()
+    total = _page_total(db, rows, count_stmt, params, offset_val, page_size, bool(cursor), skip_total)
+    next_cursor = _encode_cursor(rows[-1]) if len(rows) == page_size else None
 
     items = [
-        QueueListItem(
-            patentId=item.patent_id,
-            abstractSha1=item.abstract_sha1,
+        QueueListItem.model_construct(
+            patent_id=item.patent_id,
+            abstract_sha1=item.abstract_sha1,
             title=item.title,
             abstract=item.abstract,
-            pubDate=item.pub_date,
+            pub_date=item.pub_date,
             source=item.source,
             status=item.status,
-            enqueuedAt=item.enqueued_at.isoformat() if item.enqueued_at else "",
-            score=score if score else None,
+            enqueued_at=item.enqueued_at.isoformat() if item.enqueued_at else "",
+            score=item.relevance or None,
         )
-        for item, score in results
+        for item in rows
     ]
 
-    return QueueListResponse(items=items, page=page, pageSize=page_size, total=total)
+    return QueueListResponse.model_construct(
+        items=items, page=page, page_size=page_size, total=total, next_cursor=next_cursor
+    )
 
 
 @app.post("/api/queue/skip")
@@ -363,21 +641,71 @@ def skip_queue_items(
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
-    from api.models import QueueItem
-
-    updated = (
-        db.query(QueueItem)
-        .filter(QueueItem.patent_id.in_(patent_ids))
-        .update({QueueItem.status: "skipped"}, synchronize_session=False)
+    # RETURNING reports which ids actually matched, in the same statement.
+    # Fixed-size chunks keep the bound-parameter count under SQLite's limit.
+    stmt = (
+        update(QueueItem)
+        .where(QueueItem.patent_id.in_(bindparam("ids", expanding=True)))
+        .values(status="skipped")
+        .returning(QueueItem.patent_id)
+        .execution_options(synchronize_session=False)
     )
+    unique_ids = list(dict.fromkeys(patent_ids))
+    updated_ids: List[str] = []
+    for i in range(0, len(unique_ids), SKIP_CHUNK_SIZE):
+        chunk = unique_ids[i : i + SKIP_CHUNK_SIZE]
+        updated_ids.extend(db.execute(stmt, {"ids": chunk}).scalars())
 
     db.commit()
 
-    return {"updated": updated, "patentIds": patent_ids}
+    # A patent can be queued under several abstract hashes; report each id once
+    return {"updated": len(updated_ids), "patentIds": list(dict.fromkeys(updated_ids))}
 
 
 # --- Ingest endpoints ---
 
+_ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")  # Local file header / empty archive
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _matches_extension(ext: str, head: bytes) -> bool:
+    """Check an upload's first bytes against its extension before queuing a job."""
+    if ext == ".zip":
+        return head.startswith(_ZIP_MAGIC)
+    if ext == ".gz":
+        return head.startswith(_GZIP_MAGIC)
+    if ext == ".xml":
+        return head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"<")
+    # CSV has no signature; just reject archives and binary data
+    return not head.startswith(_ZIP_MAGIC + (_GZIP_MAGIC,)) and b"\x00" not in head
+
+
+def _spool_upload(src, dest: Path) -> None:
+    """Write the upload to dest in UPLOAD_COPY_BUFFER chunks with raw os.write calls."""
+    fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        while chunk := src.read(UPLOAD_COPY_BUFFER):
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _create_ingest_job(db: Session, filename: str):
+    job = IngestJob(filename=filename, status="pending")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _fail_ingest_job(db: Session, job, message: str) -> None:
+    job.status = 'failed'
+    job.log = message
+    db.commit()
+
+
 @app.post("/api/ingest", response_model=IngestJobResponse)
 async def start_ingest(
     background_tasks: BackgroundTasks,
@@ -389,8 +717,6 @@ async def start_ingest(
     Upload and ingest USPTO file (CSV, XML, XML.GZ, or ZIP).
     Parses file, deduplicates against scores DB, queues new patents for scoring.
     """
-    from api.models import IngestJob
-    from api.ingest_service import process_ingest_job
     
     # Validate file type
     filename = file.filename or "upload"
@@ -400,25 +726,26 @@ async def start_ingest(
             status_code=400,
             detail=f"Unsupported file type: {ext}. Supported: .csv, .xml, .gz, .zip"
         )
+    # Reject mislabelled files up front rather than failing a background job on them
+    head = await file.read(64)
+    await file.seek(0)
+    if not _matches_extension(ext, head):
+        raise HTTPException(status_code=400, detail=f"File content does not match its {ext} extension")
     
-    # Create ingest job
-    job = IngestJob(filename=filename, status="pending")
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    # Create ingest job (DB work runs on a worker thread, off the event loop)
+    job = await run_in_threadpool(_create_ingest_job, db, filename)
     
     # Save uploaded file temporarily
     temp_dir = Path(tempfile.gettempdir()) / "patent_ingest"
     temp_dir.mkdir(exist_ok=True)
-    temp_file = temp_dir / f"job_{job.id}_{filename}"
+    # Only the base name: the client controls filename
+    temp_file = temp_dir / f"job_{job.id}_{Path(filename).name}"
     
     try:
-        with open(temp_file, 'wb') as f:
-            shutil.copyfileobj(file.file, f)
+        # Copy on a worker thread so large uploads don't stall the event loop
+        await run_in_threadpool(_spool_upload, file.file, temp_file)
     except Exception as e:
-        job.status = 'failed'
-        job.log = f"File upload failed: {str(e)}"
-        db.commit()
+        await run_in_threadpool(_fail_ingest_job, db, job, f"File upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
     
     # Process in background
@@ -441,19 +768,17 @@ def get_ingest_job(
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
-    from api.models import IngestJob
-
-    job = db.query(IngestJob).get(job_id)
+    job = db.get(IngestJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Ingest job not found")
 
-    return IngestJobResponse(
-        jobId=job.id,
+    return IngestJobResponse.model_construct(
+        job_id=job.id,
         filename=job.filename,
         status=job.status,
-        matchedCount=job.matched_count,
-        enqueuedCount=job.enqueued_count,
-        csvUrl=None,
+        matched_count=job.matched_count,
+        enqueued_count=job.enqueued_count,
+        csv_url=None,
         log=job.log,
     )
 
@@ -470,15 +795,12 @@ async def process_scoring_batch(
     batch_size: int = 10,
     mode: str = "keyword",
     min_relevance: str = "Medium",
-    db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
     """
     Process a batch of pending patents from queue.
     Scores them and stores Medium/High relevance results.
     """
-    from api.scoring_service import process_queue_batch
-    
     # Run in background
     background_tasks.add_task(
         process_queue_batch,
@@ -499,15 +821,12 @@ async def process_all_pending(
     mode: str = "keyword",
     min_relevance: str = "Medium",
     batch_size: int = 10,
-    db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
     """
     Process all pending patents in queue.
     Continues until queue is empty.
     """
-    from api.scoring_service import process_all_pending as process_all
-    
     # Run in background
     background_tasks.add_task(
         process_all,
@@ -529,134 +848,220 @@ from pydantic import BaseModel
 class SyncRequest(BaseModel):
     patent_ids: List[str]
 
+def _load_sync_scores(patent_ids: List[str]) -> Tuple[List[Tuple[str, dict]], Set[str]]:
+    """
+    Read the High/Medium scores for patent_ids as (patent_id, Airtable fields)
+    pairs, plus the ids the local airtable_synced mirror recently confirmed.
+    """
+    with SessionLocal() as db:
+        known = set(
+            db.scalars(
+                select(AirtableSynced.patent_id).where(
+                    AirtableSynced.patent_id.in_(patent_ids),
+                    AirtableSynced.synced_at >= utcnow() - AIRTABLE_SYNCED_TTL,
+                )
+            )
+        )
+        scores = (
+            db.query(Score)
+            .filter(Score.patent_id.in_(patent_ids), Score.relevance.in_(["High", "Medium"]))
+            .all()
+        )
+        rows = []
+        for score in scores:
+            # Prepare Airtable fields (using Airtable's field names)
+            fields = {
+                "Patent ID": score.patent_id,
+                "Abstract": getattr(score, "abstract", "") or "",
+                "Relevance": score.relevance,
+                # To avoid Airtable 422 INVALID_MULTIPLE_CHOICE_OPTIONS when options are not pre-defined
+                # in the base (and API token cannot create them), omit values and send an empty list.
+                # If needed, we can later update this to filter against a configured allowlist.
+                "Subsystem": [],
+                "Publication Date": getattr(score, "pub_date", "") or "",
+            }
+            # Do NOT include Title unless the Airtable schema has that field.
+            # Current base does not include a Title field, so we omit it to avoid 422 UNKNOWN_FIELD_NAME.
+            rows.append((score.patent_id, fields))
+        return rows, known
+
+
+def _record_synced(entries: List[Tuple[str, Optional[str]]]) -> None:
+    """Remember (patent_id, airtable_id) pairs as present in Airtable, as of now."""
+    if not entries:
+        return
+    insert_stmt = sqlite_insert(AirtableSynced)
+    with SessionLocal() as db:
+        db.execute(
+            # Re-confirmed stale entries get a fresh synced_at; a lookup keeps the known record id
+            insert_stmt.on_conflict_do_update(
+                index_elements=["patent_id"],
+                set_={
+                    "airtable_id": func.coalesce(insert_stmt.excluded.airtable_id, AirtableSynced.airtable_id),
+                    "synced_at": func.now(),
+                },
+            ),
+            [{"patent_id": pid, "airtable_id": at_id} for pid, at_id in entries],
+        )
+        db.commit()
+
+
+def _remove_low_scored(patent_ids: List[str]) -> int:
+    """Drop queue items whose score for patent_ids is Low; returns how many were removed."""
+    with SessionLocal() as db:
+        # One DELETE matching queue rows against their Low score, no per-row lookups
+        low_score = (
+            select(literal_column("1"))
+            .where(
+                Score.patent_id == QueueItem.patent_id,
+                Score.abstract_sha1 == QueueItem.abstract_sha1,
+                Score.relevance == "Low",
+            )
+            .exists()
+        )
+        result = db.execute(
+            delete(QueueItem).where(QueueItem.patent_id.in_(patent_ids), low_score)
+        )
+        db.commit()
+        return result.rowcount
+
+
+async def _create_airtable_rows(rows: List[dict]) -> List[dict]:
+    """Create the first of rows (all for one patent) that Airtable accepts; the rest are skipped."""
+    details: List[dict] = []
+    created = False
+    for fields in rows:
+        patent_id = fields["Patent ID"]
+        if created:
+            logger.info(f"Skipping {patent_id} - already in Airtable")
+            details.append({"patent_id": patent_id, "status": "skipped", "reason": "already exists"})
+            continue
+        try:
+            create_resp = await airtable_service.create_record_async(fields)
+        except Exception as e:
+            logger.error(f"Sync error for {patent_id}: {e}")
+            details.append({"patent_id": patent_id, "status": "error", "error": str(e)})
+            continue
+        if create_resp.is_success:
+            logger.info(f"Synced {patent_id} to Airtable")
+            created = True
+            at_id = None
+            try:
+                at_id = create_resp.json().get("id")
+            except Exception:
+                pass
+            details.append({"patent_id": patent_id, "status": "synced", "airtable_id": at_id})
+        else:
+            err_text = None
+            try:
+                err_text = create_resp.text
+            except Exception:
+                err_text = None
+            logger.error(f"Failed to sync {patent_id}: {create_resp.status_code} - {err_text}")
+            details.append({
+                "patent_id": patent_id,
+                "status": "error",
+                "code": create_resp.status_code,
+                "error": (err_text[:300] if isinstance(err_text, str) else None)
+            })
+    return details
+
+
+async def _create_airtable_chunk(groups: List[List[dict]]) -> List[dict]:
+    """
+    Create one record per patent group with a single multi-record POST. If
+    Airtable rejects the batch, fall back to per-patent creates so one bad
+    record only fails itself.
+    """
+    try:
+        resp = await airtable_service.create_records_async([rows[0] for rows in groups])
+    except Exception as e:
+        logger.warning(f"Airtable batch create failed, retrying per record: {e}")
+        resp = None
+    if resp is None or not resp.is_success:
+        results = await asyncio.gather(*(_create_airtable_rows(rows) for rows in groups))
+        return [d for group in results for d in group]
+
+    try:
+        created = resp.json().get("records") or []
+    except Exception:
+        created = []
+    details: List[dict] = []
+    for i, rows in enumerate(groups):
+        patent_id = rows[0]["Patent ID"]
+        logger.info(f"Synced {patent_id} to Airtable")
+        at_id = created[i].get("id") if i < len(created) else None
+        details.append({"patent_id": patent_id, "status": "synced", "airtable_id": at_id})
+        for fields in rows[1:]:
+            logger.info(f"Skipping {fields['Patent ID']} - already in Airtable")
+            details.append({"patent_id": fields["Patent ID"], "status": "skipped", "reason": "already exists"})
+    return details
+
+
 @app.post("/api/sync-airtable")
-def sync_to_airtable(
+async def sync_to_airtable(
     request: SyncRequest,
     api_key: str = Depends(get_api_key),
 ):
     """
-    Sync selected scored patents to Airtable (synchronous).
+    Sync selected scored patents to Airtable.
     - Only syncs High/Medium scored items from the provided patent_ids.
     - Removes Low-scored items from the queue for those ids.
+    Airtable calls run concurrently on the shared async client; DB work runs in the threadpool.
     Returns a summary of actions.
     """
-    from api import airtable_service
-    from api.models import Score, QueueItem
-    from api.db import SessionLocal
-
     patent_ids = request.patent_ids or []
-    db = SessionLocal()
+    if not patent_ids:
+        return {"ok": False, "message": "No patent_ids provided", "synced": 0, "skipped": 0, "errors": 0, "removed": 0}
+
     try:
-        if not patent_ids:
-            return {"ok": False, "message": "No patent_ids provided", "synced": 0, "skipped": 0, "errors": 0, "removed": 0}
+        scores, known = await run_in_threadpool(_load_sync_scores, patent_ids)
 
-        # Get High/Medium scores for the selected patent_ids
-        scores = (
-            db.query(Score)
-            .filter(Score.patent_id.in_(patent_ids), Score.relevance.in_(["High", "Medium"]))
-            .all()
-        )
+        # Patents in the local mirror need no lookup; the rest get one OR()
+        # lookup per 10 patents instead of one GET per score
+        try:
+            found = await airtable_service.existing_patent_ids_async(
+                [pid for pid, _ in scores if pid not in known]
+            )
+        except Exception as e:
+            # As before, a failed existence check doesn't block creating records
+            logger.warning(f"Airtable existence check failed: {e}")
+            found = set()
+        already_synced = known | found
 
-        synced = 0
-        skipped = 0
-        errors = 0
         details: List[dict] = []
-
-        import requests
-
-        for score in scores:
-            try:
-                # Prepare Airtable fields (using Airtable's field names)
-                subsystem = json.loads(score.subsystem_json) if getattr(score, "subsystem_json", None) else []
-                fields = {
-                    "Patent ID": score.patent_id,
-                    "Abstract": getattr(score, "abstract", "") or "",
-                    "Relevance": score.relevance,
-                    # To avoid Airtable 422 INVALID_MULTIPLE_CHOICE_OPTIONS when options are not pre-defined
-                    # in the base (and API token cannot create them), omit values and send an empty list.
-                    # If needed, we can later update this to filter against a configured allowlist.
-                    "Subsystem": [],
-                    "Publication Date": getattr(score, "pub_date", "") or "",
-                }
-                # Do NOT include Title unless the Airtable schema has that field.
-                # Current base does not include a Title field, so we omit it to avoid 422 UNKNOWN_FIELD_NAME.
-
-                # Check for existing by Patent ID using filterByFormula
-                base = airtable_service.AIRTABLE_BASE_ID
-                table = airtable_service.AIRTABLE_TABLE_NAME
-                headers = airtable_service._base_headers()
-                formula = urllib.parse.quote("{Patent ID}='" + score.patent_id.replace("'", "\\'") + "'")
-                list_url = f"https://api.airtable.com/v0/{base}/{table}?maxRecords=1&filterByFormula={formula}"
-                list_resp = requests.get(list_url, headers=headers)
-                if list_resp.ok and list_resp.json().get("records"):
-                    logger.info(f"Skipping {score.patent_id} - already in Airtable")
-                    skipped += 1
-                    details.append({
-                        "patent_id": score.patent_id,
-                        "status": "skipped",
-                        "reason": "already exists"
-                    })
-                    continue
-
-                # Create record
-                create_url = f"https://api.airtable.com/v0/{base}/{table}"
-                create_resp = requests.post(create_url, headers=headers, json={"fields": fields})
-                if create_resp.ok:
-                    logger.info(f"Synced {score.patent_id} to Airtable")
-                    synced += 1
-                    at_id = None
-                    try:
-                        at_id = create_resp.json().get("id")
-                    except Exception:
-                        pass
-                    details.append({
-                        "patent_id": score.patent_id,
-                        "status": "synced",
-                        "airtable_id": at_id
-                    })
-                else:
-                    err_text = None
-                    try:
-                        err_text = create_resp.text
-                    except Exception:
-                        err_text = None
-                    logger.error(
-                        f"Failed to sync {score.patent_id}: {create_resp.status_code} - {err_text}"
-                    )
-                    errors += 1
-                    details.append({
-                        "patent_id": score.patent_id,
-                        "status": "error",
-                        "code": create_resp.status_code,
-                        "error": (err_text[:300] if isinstance(err_text, str) else None)
-                    })
-            except Exception as e:
-                logger.error(f"Sync error for {getattr(score, 'patent_id', '?')}: {e}")
-                errors += 1
-                details.append({
-                    "patent_id": getattr(score, 'patent_id', None),
-                    "status": "error",
-                    "error": str(e)
-                })
-
-        # Remove Low-scored queue items for these patent_ids
-        low_scores = (
-            db.query(Score).filter(Score.patent_id.in_(patent_ids), Score.relevance == "Low").all()
-        )
-        removed = 0
-        for score in low_scores:
-            qi = (
-                db.query(QueueItem)
-                .filter(
-                    QueueItem.patent_id == score.patent_id,
-                    QueueItem.abstract_sha1 == score.abstract_sha1,
-                )
-                .first()
+        pending: dict = {}
+        for patent_id, fields in scores:
+            if patent_id in already_synced:
+                logger.info(f"Skipping {patent_id} - already in Airtable")
+                details.append({"patent_id": patent_id, "status": "skipped", "reason": "already exists"})
+            else:
+                pending.setdefault(patent_id, []).append(fields)
+
+        # Up to 10 patents per POST, chunks sent concurrently; the shared rate
+        # limiter and _ASYNC_SLOTS keep this within Airtable's limits
+        groups = list(pending.values())
+        chunk = airtable_service.AIRTABLE_BATCH_SIZE
+        for group in await asyncio.gather(
+            *(_create_airtable_chunk(groups[i : i + chunk]) for i in range(0, len(groups), chunk))
+        ):
+            details.extend(group)
+
+        synced = sum(1 for d in details if d["status"] == "synced")
+        skipped = sum(1 for d in details if d["status"] == "skipped")
+        errors = sum(1 for d in details if d["status"] == "error")
+
+        try:
+            await run_in_threadpool(
+                _record_synced,
+                [(pid, None) for pid in found]
+                + [(d["patent_id"], d.get("airtable_id")) for d in details if d["status"] == "synced"],
             )
-            if qi:
-                db.delete(qi)
-                removed += 1
-        db.commit()
+        except Exception as e:
+            # The mirror only saves lookups; losing an update costs one lookup next time
+            logger.warning(f"Failed to record synced patents locally: {e}")
+
+        removed = await run_in_threadpool(_remove_low_scored, patent_ids)
 
         return {
             "ok": True,
@@ -669,8 +1074,5 @@ def sync_to_airtable(
         }
     except Exception as e:
         logger.error(f"Airtable sync failed: {e}", exc_info=True)
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Airtable sync failed: {e}")
-    finally:
-        db.close()
  
\ No newline at end of file
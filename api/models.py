@@ -1,8 +1,9 @@
 """
 SQLAlchemy ORM models for the patent scoring system.
-Implements three tables: scores, queue, and ingest_jobs per the spec.
+Implements the scores, queue, and ingest_jobs tables per the spec, plus a
+local mirror of which patents have been synced to Airtable.
 """
-from sqlalchemy import Column, Integer, Text, String, DateTime, Index
+from sqlalchemy import Column, Integer, Text, String, DateTime, Index, column, table
 from sqlalchemy.sql import func
 from api.db import Base
 
@@ -10,7 +11,8 @@ from api.db import Base
 class Score(Base):
     """
     Results cache for scored patents.
-    PK: (patent_id, abstract_sha1)
+    PK: (patent_id, abstract_sha1) -- the PK's unique index also serves the
+    ingest dedup lookups, so no separate composite index is declared.
     """
     __tablename__ = "scores"
 
@@ -25,17 +27,74 @@ class Score(Base):
     model_id = Column(Text, nullable=True)  # e.g., gpt-4o-mini
     prompt_version = Column(Text, nullable=True)  # e.g., v1.0
     scored_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    search_id = Column(Integer, nullable=True)  # scores_fts key, assigned by trigger on insert
 
+    # Filter column first, then the list sort key, so /api/scores pages come
+    # straight off an index range instead of a full scan + sort
     __table_args__ = (
-        Index("idx_scores_relevance", "relevance"),
+        Index("idx_scores_relevance_scored", "relevance", scored_at.desc()),
+        Index("idx_scores_source_scored", "source", scored_at.desc()),
+        # Both filters at once: seek straight to the pair, already in scored_at order
+        Index("idx_scores_relevance_source_scored", "relevance", "source", scored_at.desc()),
+        Index("idx_scores_scored_at", scored_at.desc()),
         Index("idx_scores_pub_date", "pub_date"),
+        Index("idx_scores_search_id", "search_id", unique=True),
     )
 
 
+# Indexes an earlier schema created that the composite ones above now cover;
+# init_db drops them so existing databases don't keep paying for their writes
+SUPERSEDED_INDEXES = ("idx_scores_relevance", "idx_queue_status")
+
+# Trigram FTS5 index over the searchable Score columns. Trigrams keep the
+# case-insensitive substring semantics of the old ILIKE search (for terms of
+# 3+ characters) while letting SQLite look matches up instead of scanning.
+# External-content table keyed on scores.search_id, not scores.rowid: scores
+# has no INTEGER PRIMARY KEY, so VACUUM may renumber its rowids, and a
+# rowid-keyed index would then match the wrong rows until rebuilt. search_id
+# is an ordinary column, so VACUUM leaves it alone. init_db rebuilds the index
+# whenever it creates it, including when it replaces an older rowid-keyed one.
+scores_fts = table("scores_fts", column("rowid"))
+
+SCORES_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS scores_fts USING fts5(
+        title, abstract, patent_id, content='scores', content_rowid='search_id', tokenize='trigram'
+    )""",
+    # New rows get the next search_id; that UPDATE then indexes them via scores_fts_au
+    """CREATE TRIGGER IF NOT EXISTS scores_fts_id AFTER INSERT ON scores WHEN new.search_id IS NULL BEGIN
+        UPDATE scores SET search_id = (SELECT coalesce(max(search_id), 0) + 1 FROM scores)
+        WHERE rowid = new.rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS scores_fts_ai AFTER INSERT ON scores WHEN new.search_id IS NOT NULL BEGIN
+        INSERT INTO scores_fts(rowid, title, abstract, patent_id)
+        VALUES (new.search_id, new.title, new.abstract, new.patent_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS scores_fts_ad AFTER DELETE ON scores WHEN old.search_id IS NOT NULL BEGIN
+        INSERT INTO scores_fts(scores_fts, rowid, title, abstract, patent_id)
+        VALUES ('delete', old.search_id, old.title, old.abstract, old.patent_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS scores_fts_au AFTER UPDATE ON scores BEGIN
+        INSERT INTO scores_fts(scores_fts, rowid, title, abstract, patent_id)
+        SELECT 'delete', old.search_id, old.title, old.abstract, old.patent_id WHERE old.search_id IS NOT NULL;
+        INSERT INTO scores_fts(rowid, title, abstract, patent_id)
+        SELECT new.search_id, new.title, new.abstract, new.patent_id WHERE new.search_id IS NOT NULL;
+    END""",
+)
+
+# What an earlier schema indexed scores_fts on rowid with; init_db drops these
+# before adding search_id, and the DDL above then recreates and rebuilds
+LEGACY_SCORES_FTS_DROPS = (
+    "DROP TRIGGER IF EXISTS scores_fts_ai",
+    "DROP TRIGGER IF EXISTS scores_fts_ad",
+    "DROP TRIGGER IF EXISTS scores_fts_au",
+    "DROP TABLE IF EXISTS scores_fts",
+)
+
+
 class QueueItem(Base):
     """
     Queue of patents to be scored.
-    PK: (patent_id, abstract_sha1)
+    PK: (patent_id, abstract_sha1) -- doubles as the dedup/conflict index.
     """
     __tablename__ = "queue"
 
@@ -49,7 +108,8 @@ class QueueItem(Base):
     status = Column(Text, nullable=False, default="pending")  # pending | scored | skipped
 
     __table_args__ = (
-        Index("idx_queue_status", "status"),
+        Index("idx_queue_status_enqueued", "status", enqueued_at.desc()),
+        Index("idx_queue_enqueued_at", enqueued_at.desc()),
     )
 
 
@@ -67,3 +127,17 @@ class IngestJob(Base):
     matched_count = Column(Integer, nullable=False, default=0)
     enqueued_count = Column(Integer, nullable=False, default=0)
     log = Column(Text, nullable=True)  # Short error/status message
+
+
+class AirtableSynced(Base):
+    """
+    Patents known to exist in Airtable, recorded by /api/sync-airtable so a
+    re-sync can skip them without an existence lookup. Airtable rows can be
+    deleted behind this mirror, so entries older than AIRTABLE_SYNCED_TTL are
+    looked up again and synced_at is refreshed when they are re-confirmed.
+    """
+    __tablename__ = "airtable_synced"
+
+    patent_id = Column(Text, primary_key=True, nullable=False)
+    airtable_id = Column(Text, nullable=True)  # None when learned from a lookup, not a create
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
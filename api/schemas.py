@@ -50,12 +50,31 @@ class ScoreResponse(BaseModel):
     sha1: str
     model_config = ConfigDict(populate_by_name=True)
 
+class BatchScoreItem(BaseModel):
+    """One patent in a batch; mapping and mode are set once for the whole batch."""
+    title: str
+    abstract: str
+    patent_id: Optional[str] = Field(None, alias="patentId")
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+class BatchScoreRequest(BaseModel):
+    """Request to score many patents against one keyword mapping."""
+    items: List[BatchScoreItem]
+    mapping: Optional[Dict[str, List[str]]] = None
+    mode: Optional[str] = Field(default="keyword", description="llm or keyword")
+
+class BatchScoreResponse(BaseModel):
+    """Response from the batch scoring endpoint, in request order."""
+    items: List[ScoreResponse]
+
 class ListRecordsResponse(BaseModel):
     """Paginated list of records (legacy endpoint)."""
     total: int
+    total_capped: bool = Field(False, alias="totalCapped")  # total is a lower bound ("2000+")
     offset: int
     limit: int
     records: List[RecordSummary]
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class ErrorResponse(BaseModel):
@@ -83,7 +102,8 @@ class ScoresListResponse(BaseModel):
     items: List[ScoreListItem]
     page: int
     page_size: int = Field(..., alias="pageSize")
-    total: int
+    total: Optional[int] = None  # None when the caller passed skip_total
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")  # Keyset cursor for the following page
     model_config = ConfigDict(populate_by_name=True)
 
 class QueueListItem(BaseModel):
@@ -104,7 +124,8 @@ class QueueListResponse(BaseModel):
     items: List[QueueListItem]
     page: int
     page_size: int = Field(..., alias="pageSize")
-    total: int
+    total: Optional[int] = None  # None when the caller passed skip_total
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")  # Keyset cursor for the following page
     model_config = ConfigDict(populate_by_name=True)
 
 class SettingsResponse(BaseModel):
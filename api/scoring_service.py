@@ -3,17 +3,42 @@ Batch scoring service for patent queue.
 Processes pending patents, scores them, filters by relevance, and stores results.
 """
 import logging
-import json
-from typing import Dict, List, Optional
-from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+import orjson
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from api.models import Score, QueueItem
 from api.db import SessionLocal
+from api.utils.time import utcnow
+from api.services.score import ScoringService
 import scorer
 
 logger = logging.getLogger(__name__)
 
+# Bulk score write; a rescored (patent_id, abstract_sha1) overwrites its row in place
+_score_insert = sqlite_insert(Score.__table__)
+_SCORE_UPSERT = _score_insert.on_conflict_do_update(
+    index_elements=['patent_id', 'abstract_sha1'],
+    set_={
+        c.name: _score_insert.excluded[c.name]
+        for c in Score.__table__.columns
+        if c.name not in ('patent_id', 'abstract_sha1')
+    },
+)
+
+
+@lru_cache(maxsize=1)
+def _llm_service() -> Optional[ScoringService]:
+    """The shared LLM scorer, or None (logged once) if openai or its key is missing."""
+    try:
+        return ScoringService()
+    except (ImportError, ValueError) as e:
+        logger.warning(f"LLM scoring unavailable ({e}), falling back to keyword")
+        return None
+
 
 def score_patent(
     title: str,
@@ -37,8 +62,10 @@ def score_patent(
         }
     """
     if mode == "llm":
-        # TODO: Implement LLM scoring
-        logger.warning("LLM scoring not yet implemented, falling back to keyword")
+        service = _llm_service()
+        if service is not None:
+            relevance, subsystem, _ = service.score_patent(title, abstract)
+            return {'relevance': relevance, 'subsystem': subsystem}
         mode = "keyword"
     
     if mode == "keyword":
@@ -72,6 +99,135 @@ def get_default_mapping() -> Dict[str, List[str]]:
     }
 
 
+def _fetch_pending(db: Session, batch_size: int) -> List[QueueItem]:
+    """Next chunk of pending queue items."""
+    return db.query(QueueItem).filter(
+        QueueItem.status == 'pending'
+    ).limit(batch_size).all()
+
+
+def _stored_llm_scores(db: Session, pending: List[QueueItem], model: str) -> Dict[Tuple[str, str], Dict]:
+    """Earlier results from this LLM model already in scores, by (patent_id, abstract_sha1)."""
+    rows = db.execute(
+        select(Score.patent_id, Score.abstract_sha1, Score.relevance, Score.subsystem_json).where(
+            tuple_(Score.patent_id, Score.abstract_sha1).in_(
+                [(item.patent_id, item.abstract_sha1) for item in pending]
+            ),
+            Score.model_id == model,
+        )
+    ).all()
+    return {
+        (row.patent_id, row.abstract_sha1): {
+            'relevance': row.relevance or 'Low',
+            'subsystem': orjson.loads(row.subsystem_json or '[]'),
+        }
+        for row in rows
+    }
+
+
+def _score_chunk(
+    db: Session,
+    pending: List[QueueItem],
+    mode: str,
+    mapping: Optional[Dict[str, List[str]]],
+    min_relevance: str
+) -> Dict:
+    """
+    Score a chunk of queue items in the caller's session: writes the kept
+    scores and updates item statuses, leaving the commit to the caller.
+    """
+    processed = 0
+    scored = 0
+    filtered = 0
+    errors = 0
+    
+    relevance_order = {"High": 3, "Medium": 2, "Low": 1}
+    min_score = relevance_order.get(min_relevance, 2)
+    # One UTC stamp for the whole batch, matching the column's server default
+    batch_scored_at = utcnow()
+    score_rows = []
+    
+    llm_results = None
+    service = _llm_service() if mode == "llm" else None
+    if service is not None:
+        # Same patent and abstract already scored by this model: reuse, don't resend
+        llm_results = _stored_llm_scores(db, pending, service.model)
+        to_send = [item for item in pending if (item.patent_id, item.abstract_sha1) not in llm_results]
+        # LLM calls are I/O-bound: score the rest of the chunk concurrently up front
+        outcomes = service.score_many(
+            [(item.title or '', item.abstract or '') for item in to_send]
+        ) if to_send else []
+        for item, outcome in zip(to_send, outcomes):
+            llm_results[(item.patent_id, item.abstract_sha1)] = (
+                outcome if isinstance(outcome, Exception)
+                else {'relevance': outcome[0], 'subsystem': outcome[1]}
+            )
+    # Label rows by the model that actually ran. Older rows used "llm-scorer" even
+    # for keyword fallbacks, so that label is never trusted for reuse.
+    model_id = service.model if service is not None else "keyword-scorer"
+    
+    for item in pending:
+        try:
+            # Score the patent
+            if llm_results is not None:
+                result = llm_results[(item.patent_id, item.abstract_sha1)]
+                if isinstance(result, Exception):
+                    raise result
+            else:
+                result = score_patent(
+                    title=item.title or '',
+                    abstract=item.abstract or '',
+                    mapping=mapping,
+                    mode=mode
+                )
+            
+            relevance = result['relevance']
+            subsystem = result['subsystem']
+            processed += 1
+            
+            # Filter by minimum relevance
+            if relevance_order.get(relevance, 0) >= min_score:
+                # Buffered for one bulk write into the scores table
+                score_rows.append(dict(
+                    patent_id=item.patent_id,
+                    abstract_sha1=item.abstract_sha1,
+                    relevance=relevance,
+                    subsystem_json=orjson.dumps(subsystem).decode(),
+                    title=item.title,
+                    abstract=item.abstract,
+                    pub_date=item.pub_date,
+                    source=item.source,
+                    model_id=model_id,
+                    prompt_version="v1.0",
+                    scored_at=batch_scored_at
+                ))
+                scored += 1
+                
+                # Update queue item status
+                item.status = 'scored'
+                logger.info(f"Scored {item.patent_id}: {relevance} ({', '.join(subsystem)})")
+            else:
+                # Low score - still mark as scored, will be removed during Airtable sync
+                item.status = 'scored'
+                filtered += 1
+                logger.info(f"Scored (Low) {item.patent_id}: {relevance}")
+            
+        except Exception as e:
+            logger.error(f"Error scoring {item.patent_id}: {e}", exc_info=True)
+            item.status = 'error'
+            errors += 1
+    
+    if score_rows:
+        db.execute(_SCORE_UPSERT, score_rows)
+    
+    return {
+        'processed': processed,
+        'scored': scored,
+        'filtered': filtered,
+        'errors': errors
+    }
+
+
 def process_queue_batch(
     batch_size: int = 10,
     mode: str = "keyword",
@@ -99,9 +255,7 @@ def process_queue_batch(
     db = SessionLocal()
     try:
         # Get pending items from queue
-        pending = db.query(QueueItem).filter(
-            QueueItem.status == 'pending'
-        ).limit(batch_size).all()
+        pending = _fetch_pending(db, batch_size)
         
         if not pending:
             logger.info("No pending items in queue")
@@ -112,71 +266,15 @@ def process_queue_batch(
                 'errors': 0
             }
         
-        processed = 0
-        scored = 0
-        filtered = 0
-        errors = 0
-        
-        relevance_order = {"High": 3, "Medium": 2, "Low": 1}
-        min_score = relevance_order.get(min_relevance, 2)
-        
-        for item in pending:
-            try:
-                # Score the patent
-                result = score_patent(
-                    title=item.title or '',
-                    abstract=item.abstract or '',
-                    mapping=mapping,
-                    mode=mode
-                )
-                
-                relevance = result['relevance']
-                subsystem = result['subsystem']
-                processed += 1
-                
-                # Filter by minimum relevance
-                if relevance_order.get(relevance, 0) >= min_score:
-                    # Store in scores table
-                    score_entry = Score(
-                        patent_id=item.patent_id,
-                        abstract_sha1=item.abstract_sha1,
-                        relevance=relevance,
-                        subsystem_json=json.dumps(subsystem),
-                        title=item.title,
-                        abstract=item.abstract,
-                        pub_date=item.pub_date,
-                        source=item.source,
-                        model_id=f"{mode}-scorer",
-                        prompt_version="v1.0",
-                        scored_at=datetime.now()
-                    )
-                    db.merge(score_entry)
-                    scored += 1
-                    
-                    # Update queue item status
-                    item.status = 'scored'
-                    logger.info(f"Scored {item.patent_id}: {relevance} ({', '.join(subsystem)})")
-                else:
-                    # Low score - still mark as scored, will be removed during Airtable sync
-                    item.status = 'scored'
-                    filtered += 1
-                    logger.info(f"Scored (Low) {item.patent_id}: {relevance}")
-                
-            except Exception as e:
-                logger.error(f"Error scoring {item.patent_id}: {e}", exc_info=True)
-                item.status = 'error'
-                errors += 1
-        
+        stats = _score_chunk(db, pending, mode, mapping, min_relevance)
         db.commit()
         
-        logger.info(f"Batch complete: {processed} processed, {scored} scored, {filtered} filtered, {errors} errors")
+        logger.info(
+            f"Batch complete: {stats['processed']} processed, {stats['scored']} scored, "
+            f"{stats['filtered']} filtered, {stats['errors']} errors"
+        )
         
-        return {
-            'processed': processed,
-            'scored': scored,
-            'filtered': filtered,
-            'errors': errors
-        }
+        return stats
     
     except Exception as e:
         logger.error(f"Batch processing error: {e}", exc_info=True)
@@ -199,7 +297,8 @@ def process_all_pending(
 ) -> Dict:
     """
     Process all pending patents in queue.
-    Continues processing batches until queue is empty.
+    Continues processing batches until queue is empty, in one session,
+    committing after each batch.
     
     Returns summary statistics.
     """
@@ -210,19 +309,30 @@ def process_all_pending(
         'errors': 0
     }
     
-    while True:
-        batch_stats = process_queue_batch(
-            batch_size=batch_size,
-            mode=mode,
-            mapping=mapping,
-            min_relevance=min_relevance
-        )
-        
-        if batch_stats['processed'] == 0:
-            break
-        
-        for key in total_stats:
-            total_stats[key] += batch_stats[key]
+    db = SessionLocal()
+    try:
+        while True:
+            # Scored items leave 'pending', so each query returns the next chunk
+            pending = _fetch_pending(db, batch_size)
+            if not pending:
+                break
+            
+            batch_stats = _score_chunk(db, pending, mode, mapping, min_relevance)
+            db.commit()
+            # Finished items aren't needed again; keep the identity map chunk-sized
+            db.expunge_all()
+            
+            for key in total_stats:
+                total_stats[key] += batch_stats[key]
+            
+            if batch_stats['processed'] == 0:
+                break
+    except Exception as e:
+        logger.error(f"Batch processing error: {e}", exc_info=True)
+        db.rollback()
+        total_stats['errors'] += 1
+    finally:
+        db.close()
     
     logger.info(f"All pending processed: {total_stats}")
     return total_stats
@@ -5,7 +5,21 @@ Used for fast pre-filtering before LLM scoring.
 """
 
 import re
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+# Below this many patterns, one regex pass per subsystem beats the Python-level
+# walk over automaton matches.
+AHOCORASICK_MIN_PATTERNS = 32
+
+KeywordMap = Tuple[Tuple[str, Tuple[str, ...]], ...]
 
 
 def normalize_text(text: str) -> str:
@@ -15,24 +29,120 @@ def normalize_text(text: str) -> str:
     return re.sub(r'\s+', ' ', text.lower().strip())
 
 
+def _wildcard_source(pattern: str) -> str:
+    """Regex source for one wildcard pattern, anchored at a word start."""
+    # Escape special regex chars except * and ?
+    escaped = re.escape(pattern)
+    # Wildcards stay inside a word; ".*" would run on to the end of the text
+    regex_pattern = escaped.replace(r'\*', r'\w*').replace(r'\?', r'\w')
+    # Add word boundaries - but only at start for prefix matching
+    # This allows "detect*" to match "detector" but not "undetected"
+    return r'\b' + regex_pattern
+
+
+@lru_cache(maxsize=4096)
 def wildcard_to_regex(pattern: str) -> re.Pattern:
     """Convert wildcard pattern to regex.
     
     Supports:
-    - * for any characters
-    - ? for single character
+    - * for any word characters
+    - ? for single word character
     - Word boundaries for exact word matching
     
+    Compiled patterns are cached, so scoring many patents against the same
+    keyword map compiles each keyword only once.
+    
     Examples:
         "mine*" matches "mine", "miner", "mineral"
         "detect*" matches "detect", "detection", "detector"
     """
-    # Escape special regex chars except * and ?
-    escaped = re.escape(pattern)
-    # Replace escaped wildcards with regex equivalents
-    regex_pattern = escaped.replace(r'\*', '.*').replace(r'\?', '.')
-    # Add word boundaries - but only at start for prefix matching`n    # This allows "detect*" to match "detector" but not "undetected"`n    regex_pattern = r'\b' + regex_pattern
-    return re.compile(regex_pattern, re.IGNORECASE)
+    return re.compile(_wildcard_source(pattern), re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _compile_subsystem(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """One alternation regex for all of a subsystem's patterns, so the text is scanned once."""
+    if not patterns:
+        return None
+    return re.compile(
+        '(?:' + '|'.join(_wildcard_source(p) for p in patterns) + ')',
+        re.IGNORECASE,
+    )
+
+
+def _is_word_char(c: str) -> bool:
+    """Same test as the regex \\w class."""
+    return c.isalnum() or c == '_'
+
+
+def _split_wildcard(pattern: str) -> Optional[Tuple[str, bool]]:
+    """(stem, is_prefix) for a literal or trailing-* pattern; None for other wildcards."""
+    stem = pattern[:-1] if pattern.endswith('*') else pattern
+    if not stem or '*' in stem or '?' in stem:
+        return None
+    return stem.lower(), len(stem) != len(pattern)
+
+
+@lru_cache(maxsize=32)
+def _build_automaton(prepared: KeywordMap):
+    """
+    One Aho-Corasick automaton over every subsystem's pattern stems, or None
+    when it isn't available, isn't worth it, or a pattern needs the regex path.
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    if sum(len(patterns) for _, patterns in prepared) < AHOCORASICK_MIN_PATTERNS:
+        return None
+    owners: Dict[str, List[Tuple[int, int, bool]]] = {}
+    for sub_idx, (_, patterns) in enumerate(prepared):
+        for pat_idx, pattern in enumerate(patterns):
+            split = _split_wildcard(pattern)
+            if split is None:
+                return None
+            stem, is_prefix = split
+            owners.setdefault(stem, []).append((sub_idx, pat_idx, is_prefix))
+    automaton = ahocorasick.Automaton()
+    for stem, stem_owners in owners.items():
+        automaton.add_word(stem, (len(stem), _is_word_char(stem[0]), tuple(stem_owners)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _automaton_findall(text: str, prepared: KeywordMap, automaton) -> List[List[str]]:
+    """Per subsystem, what the fused regex's findall would return, from one pass over text."""
+    # Every (start, pattern index, end) hit per subsystem
+    candidates: List[List[Tuple[int, int, int]]] = [[] for _ in prepared]
+    size = len(text)
+    for last, (length, word_start, stem_owners) in automaton.iter(text):
+        start = last - length + 1
+        # Leading \b: word-ness must flip between the previous char and the stem
+        if (start > 0 and _is_word_char(text[start - 1])) == word_start:
+            continue
+        end = last + 1
+        word_end = None
+        for sub_idx, pat_idx, is_prefix in stem_owners:
+            if is_prefix:
+                if word_end is None:
+                    # Trailing \w*
+                    word_end = end
+                    while word_end < size and _is_word_char(text[word_end]):
+                        word_end += 1
+                candidates[sub_idx].append((start, pat_idx, word_end))
+            else:
+                candidates[sub_idx].append((start, pat_idx, end))
+
+    results = []
+    for hits in candidates:
+        # Leftmost first, earliest alternative on ties, no overlaps: findall's order
+        hits.sort()
+        found = []
+        pos = 0
+        for start, _, stop in hits:
+            if start >= pos:
+                found.append(text[start:stop])
+                pos = stop
+        results.append(found)
+    return results
 
 
 def match_keywords(
@@ -56,17 +166,20 @@ def match_keywords(
         Example: {"Detection": ["sensor", "detection"], "Mobility": ["tracked"]}
     """
     normalized_text = normalize_text(text)
+    prepared: KeywordMap = tuple((subsystem, tuple(patterns)) for subsystem, patterns in keyword_map.items())
+    automaton = _build_automaton(prepared)
+    if automaton is not None:
+        found_per_subsystem = _automaton_findall(normalized_text, prepared, automaton)
+    else:
+        found_per_subsystem = []
+        for _, patterns in prepared:
+            regex = _compile_subsystem(patterns)
+            found_per_subsystem.append(regex.findall(normalized_text) if regex else [])
+
     matches: Dict[str, List[str]] = {}
-    
-    for subsystem, patterns in keyword_map.items():
-        subsystem_matches: List[str] = []
-        
-        for pattern in patterns:
-            regex = wildcard_to_regex(pattern)
-            found = regex.findall(normalized_text)
-            if found:
-                # Add unique matches
-                subsystem_matches.extend([m for m in found if m not in subsystem_matches])
+    for (subsystem, _), found in zip(prepared, found_per_subsystem):
+        # Unique matches, in order of first appearance
+        subsystem_matches = list(dict.fromkeys(found))
         
         if len(subsystem_matches) >= min_matches:
             matches[subsystem] = subsystem_matches
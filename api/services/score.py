@@ -3,21 +3,56 @@
 Uses LLM to analyze patent relevance and classify into subsystems.
 """
 
+import asyncio
+import hashlib
 import os
 import json
-from typing import List, Dict, Optional, Tuple
+import threading
+from typing import List, Dict, Optional, Sequence, Tuple, Union
+from cachetools import LRUCache
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Check if openai is available
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
+    AsyncOpenAI = None
     OpenAI = None
 
+# Concurrent OpenAI calls per score_many batch; the API's rate limits, not
+# this, should be what bounds LLM batch throughput
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+
+SYSTEM_PROMPT = "You are a patent analysis expert specializing in robotics and demining technology."
+
+# Parsed LLM results by (model, prompt_version, title+abstract hash), so the
+# same text (re-queued items, patent family members) is only sent once
+LLM_CACHE_SIZE = 10_000
+_RESULT_CACHE: LRUCache = LRUCache(maxsize=LLM_CACHE_SIZE)
+_RESULT_LOCK = threading.Lock()
+
+Result = Tuple[str, List[str], str]
+
+
+def _cache_get(key: Tuple[str, str, str]) -> Optional[Result]:
+    with _RESULT_LOCK:
+        hit = _RESULT_CACHE.get(key)
+    if hit is None:
+        return None
+    relevance, subsystems, reasoning = hit
+    # Callers get their own list; the cached entry stays untouched
+    return relevance, list(subsystems), reasoning
+
+
+def _cache_put(key: Tuple[str, str, str], result: Result) -> None:
+    relevance, subsystems, reasoning = result
+    with _RESULT_LOCK:
+        _RESULT_CACHE[key] = (relevance, tuple(subsystems), reasoning)
+
 
 class ScoringService:
     """Service for scoring patents using OpenAI LLM."""
@@ -110,56 +145,163 @@ Respond with valid JSON only."""
         Raises:
             Exception: If OpenAI API call fails or response is invalid
         """
-        prompt = self.build_prompt(title, abstract, prompt_version)
+        key = self._result_key(title, abstract, prompt_version)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
         
         try:
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a patent analysis expert specializing in robotics and demining technology."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent results
-                max_tokens=500
+                **self._completion_args(title, abstract, prompt_version)
             )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Parse JSON response
-            # Handle markdown code blocks if present
-            if content.startswith("```"):
-                # Extract JSON from markdown code block
-                lines = content.split('\n')
-                json_lines = []
-                in_code_block = False
-                for line in lines:
-                    if line.strip().startswith("```"):
-                        in_code_block = not in_code_block
-                        continue
-                    if in_code_block or (not line.strip().startswith("```")):
-                        json_lines.append(line)
-                content = '\n'.join(json_lines)
-            
-            result = json.loads(content)
-            
-            relevance = result.get("relevance", "Low")
-            subsystems = result.get("subsystem", [])
-            reasoning = result.get("reasoning", "")
-            
-            # Validate relevance
-            if relevance not in ["High", "Medium", "Low"]:
-                relevance = "Low"
-            
-            # Ensure subsystems is a list
-            if not isinstance(subsystems, list):
-                subsystems = [subsystems] if subsystems else []
-            
-            return relevance, subsystems, reasoning
-            
+            result = self._parse_response(response.choices[0].message.content)
+        except json.JSONDecodeError as e:
+            raise Exception(f"Failed to parse LLM response as JSON: {e}")
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {e}")
+        
+        _cache_put(key, result)
+        return result
+    
+    async def score_patent_async(
+        self,
+        title: str,
+        abstract: str,
+        prompt_version: str = "v1.0",
+        client=None
+    ) -> Tuple[str, List[str], str]:
+        """Async counterpart of score_patent.
+        
+        Args:
+            client: AsyncOpenAI client to send through (one is opened per call
+                if omitted; score_many shares one across its batch)
+        """
+        key = self._result_key(title, abstract, prompt_version)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+        
+        if client is None:
+            async with AsyncOpenAI(api_key=self.api_key) as own_client:
+                return await self.score_patent_async(title, abstract, prompt_version, client=own_client)
+        
+        try:
+            response = await client.chat.completions.create(
+                **self._completion_args(title, abstract, prompt_version)
+            )
+            result = self._parse_response(response.choices[0].message.content)
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse LLM response as JSON: {e}")
         except Exception as e:
             raise Exception(f"OpenAI API error: {e}")
+        
+        _cache_put(key, result)
+        return result
+    
+    def score_many(
+        self,
+        items: Sequence[Tuple[str, str]],
+        prompt_version: str = "v1.0",
+        concurrency: int = LLM_CONCURRENCY
+    ) -> List[Union[Result, Exception]]:
+        """Score (title, abstract) pairs concurrently, from synchronous code.
+        
+        LLM calls are I/O-bound, so a batch takes roughly as long as its
+        slowest calls rather than the sum of them.
+        
+        Returns:
+            One entry per item, in order: the score_patent tuple, or the
+            exception raised for that item
+        """
+        results: list = [None] * len(items)
+        # Cache misses by key; identical texts within the batch share one call
+        misses: Dict[Tuple[str, str, str], List[int]] = {}
+        for idx, (title, abstract) in enumerate(items):
+            key = self._result_key(title, abstract, prompt_version)
+            cached = _cache_get(key)
+            if cached is not None:
+                results[idx] = cached
+            else:
+                misses.setdefault(key, []).append(idx)
+        
+        if misses:
+            to_score = [items[idxs[0]] for idxs in misses.values()]
+            outcomes = asyncio.run(self._score_many_async(to_score, prompt_version, concurrency))
+            for idxs, outcome in zip(misses.values(), outcomes):
+                for idx in idxs:
+                    results[idx] = outcome
+        return results
+    
+    async def _score_many_async(
+        self,
+        items: Sequence[Tuple[str, str]],
+        prompt_version: str,
+        concurrency: int
+    ) -> list:
+        limit = asyncio.Semaphore(max(1, concurrency))
+        # One client per batch: its connection pool belongs to this event loop
+        async with AsyncOpenAI(api_key=self.api_key) as client:
+            async def score_one(title: str, abstract: str):
+                async with limit:
+                    return await self.score_patent_async(title, abstract, prompt_version, client=client)
+            
+            return await asyncio.gather(
+                *(score_one(title, abstract) for title, abstract in items),
+                return_exceptions=True
+            )
+    
+    def _result_key(self, title: str, abstract: str, prompt_version: str) -> Tuple[str, str, str]:
+        """Result cache key: the prompt only varies with these."""
+        digest = hashlib.sha1(f"{title}\n{abstract}".encode("utf-8")).hexdigest()
+        return self.model, prompt_version, digest
+    
+    def _completion_args(self, title: str, abstract: str, prompt_version: str) -> Dict:
+        """Chat completion request shared by the sync and async paths."""
+        return dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": self.build_prompt(title, abstract, prompt_version)}
+            ],
+            temperature=0.3,  # Lower temperature for more consistent results
+            max_tokens=500
+        )
+    
+    @staticmethod
+    def _parse_response(content: str) -> Tuple[str, List[str], str]:
+        """Parse the model's JSON reply into (relevance, subsystems, reasoning)."""
+        content = content.strip()
+        
+        # Parse JSON response
+        # Handle markdown code blocks if present
+        if content.startswith("```"):
+            # Extract JSON from markdown code block
+            lines = content.split('\n')
+            json_lines = []
+            in_code_block = False
+            for line in lines:
+                if line.strip().startswith("```"):
+                    in_code_block = not in_code_block
+                    continue
+                if in_code_block or (not line.strip().startswith("```")):
+                    json_lines.append(line)
+            content = '\n'.join(json_lines)
+        
+        result = json.loads(content)
+        
+        relevance = result.get("relevance", "Low")
+        subsystems = result.get("subsystem", [])
+        reasoning = result.get("reasoning", "")
+        
+        # Validate relevance
+        if relevance not in ["High", "Medium", "Low"]:
+            relevance = "Low"
+        
+        # Ensure subsystems is a list
+        if not isinstance(subsystems, list):
+            subsystems = [subsystems] if subsystems else []
+        
+        return relevance, subsystems, reasoning
 
 
 # Convenience function for direct use
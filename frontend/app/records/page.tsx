@@ -9,6 +9,7 @@ const PAGE_SIZE = 25;
 export default function RecordsPage() {
   const [records, setRecords] = useState<RecordSummary[]>([]);
   const [total, setTotal] = useState(0);
+  const [totalCapped, setTotalCapped] = useState(false);
   const [offset, setOffset] = useState(0);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string>("");
@@ -37,6 +38,7 @@ export default function RecordsPage() {
         if (res.ok) {
           setRecords(res.data.records);
           setTotal(res.data.total);
+          setTotalCapped(Boolean(res.data.totalCapped));
         } else {
           setError(res.error);
         }
@@ -121,7 +123,7 @@ export default function RecordsPage() {
         <button onClick={prevPage} disabled={offset === 0} className="rounded border px-3 py-1 disabled:opacity-50">Prev</button>
         <button onClick={nextPage} disabled={offset + PAGE_SIZE >= total} className="rounded border px-3 py-1 disabled:opacity-50">Next</button>
         <span>
-          Page {page} of {totalPages} • Total {total}
+          Page {page} of {totalPages}{totalCapped ? "+" : ""} • Total {total}{totalCapped ? "+" : ""}
         </span>
       </div>
 
@@ -51,6 +51,7 @@ export type RecordSummary = {
 
 export type ListRecordsResponse = {
   total: number;
+  totalCapped?: boolean; // total is a lower bound ("2000+")
   offset: number;
   limit: number;
   records: RecordSummary[];
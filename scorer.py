@@ -1,13 +1,69 @@
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
 
-def keyword_score(text: str = '', title: str = '', abstract: str = '', keywords: List[str] = None, mapping: Dict[str, List[str]] = None) -> Dict:
-    content = f"{title} {abstract} {text}".lower()
+# Below this many keywords, per-keyword str.count (a C loop each) beats the
+# Python-level iteration over automaton matches.
+AHOCORASICK_MIN_KEYWORDS = 32
+
+Prepared = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+# Recently scored texts; repeat /score calls for the same abstract skip the match pass
+SCORE_CACHE_SIZE = 8192
+
+
+def _prepare_mapping(mapping: Optional[Dict[str, List[str]]]) -> Prepared:
+    return tuple((subsystem, tuple(kws)) for subsystem, kws in mapping.items()) if mapping else ()
+
+
+@lru_cache(maxsize=32)
+def _build_automaton(prepared: Prepared):
+    """One Aho-Corasick automaton for every keyword of a mapping, or None if not worth it."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    keywords = [k for _, kws in prepared for k in kws]
+    if len(keywords) < AHOCORASICK_MIN_KEYWORDS or not all(keywords):
+        return None
+    owners: Dict[str, List[int]] = {}
+    for idx, (_, kws) in enumerate(prepared):
+        for k in kws:
+            owners.setdefault(k, []).append(idx)
+    automaton = ahocorasick.Automaton()
+    for kw_id, (k, idxs) in enumerate(owners.items()):
+        automaton.add_word(k, (kw_id, len(k), tuple(idxs)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _subsystem_counts(content: str, prepared: Prepared) -> List[int]:
+    automaton = _build_automaton(prepared)
+    if automaton is None:
+        return [sum(content.count(k) for k in kws) for _, kws in prepared]
+
+    # Single pass over the text. Each keyword counts non-overlapping hits,
+    # leftmost first, exactly like str.count.
+    counts = [0] * len(prepared)
+    last_end: Dict[int, int] = {}
+    for end, (kw_id, length, idxs) in automaton.iter(content):
+        if end - length < last_end.get(kw_id, -1):
+            continue
+        last_end[kw_id] = end
+        for idx in idxs:
+            counts[idx] += 1
+    return counts
+
+
+def _score_content(content: str, prepared: Prepared, keywords: Optional[List[str]]) -> Dict:
     subsystems = []
     total_matches = 0
-    if mapping:
-        for subsystem, kws in mapping.items():
-            count = sum(content.count(k) for k in kws)
+    if prepared:
+        for (subsystem, _), count in zip(prepared, _subsystem_counts(content, prepared)):
             if count > 0:
                 subsystems.append(subsystem)
                 total_matches += count
@@ -23,3 +79,25 @@ def keyword_score(text: str = '', title: str = '', abstract: str = '', keywords:
         relevance = 'Low'
 
     return {'Relevance': relevance, 'Subsystem': subsystems}
+
+
+@lru_cache(maxsize=SCORE_CACHE_SIZE)
+def _score_cached(content: str, prepared: Prepared, keywords: Optional[Tuple[str, ...]]) -> Tuple[str, Tuple[str, ...]]:
+    result = _score_content(content, prepared, keywords)
+    return result['Relevance'], tuple(result['Subsystem'])
+
+
+def keyword_score(text: str = '', title: str = '', abstract: str = '', keywords: List[str] = None, mapping: Dict[str, List[str]] = None) -> Dict:
+    content = f"{title} {abstract} {text}".lower()
+    relevance, subsystems = _score_cached(content, _prepare_mapping(mapping), tuple(keywords) if keywords else None)
+    # Fresh dict and list per call so callers can't mutate the cached entry
+    return {'Relevance': relevance, 'Subsystem': list(subsystems)}
+
+
+def keyword_score_many(titles: Sequence[str], abstracts: Sequence[str], mapping: Dict[str, List[str]] = None, keywords: List[str] = None) -> List[Dict]:
+    """Score many title/abstract pairs against one mapping, preparing it only once."""
+    prepared = _prepare_mapping(mapping)
+    return [
+        _score_content(f"{title} {abstract} ".lower(), prepared, keywords)
+        for title, abstract in zip(titles, abstracts)
+    ]
@@ -6,7 +6,7 @@ from api import airtable_service
 
 try:
     print("Testing fetch_records...")
-    records, total = airtable_service.fetch_records(limit=5, offset=0)
+    records, total, total_exact = airtable_service.fetch_records(limit=5, offset=0)
     print(f"Total records: {total}")
     print(f"Returned: {len(records)} records")
     if records:
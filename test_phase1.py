@@ -13,7 +13,7 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from api.db import Base
-from api.models import Score, QueueItem, IngestJob
+from api.models import Score, QueueItem, IngestJob, AirtableSynced
 from api.utils.hash import compute_abstract_sha1
 from api.utils.time import utcnow, utcnow_iso
 
@@ -242,6 +242,319 @@ def test_ingest_job_completion(test_session):
     assert retrieved.completed_at is not None
 
 
+def test_airtable_synced_model_create(test_session):
+    """Test recording a patent as synced to Airtable."""
+    test_session.add(AirtableSynced(patent_id="US9876543B2", airtable_id="recABC"))
+    test_session.commit()
+
+    retrieved = test_session.get(AirtableSynced, "US9876543B2")
+    assert retrieved.airtable_id == "recABC"
+    assert retrieved.synced_at is not None
+
+
+# === Ingest Service Tests ===
+
+def test_process_ingest_job_dedup(test_engine, test_session, tmp_path, monkeypatch):
+    """Test ingest skips scored/queued patents and enqueues only new ones."""
+    from api import ingest_service
+    from api.ingest_service import compute_sha1, process_ingest_job
+
+    monkeypatch.setattr(ingest_service, "SessionLocal", sessionmaker(bind=test_engine))
+
+    scored_abstract = "An autonomous robot that detects buried landmines."
+    queued_abstract = "A tracked vehicle with a ground penetrating radar."
+    test_session.add(Score(patent_id="US1", abstract_sha1=compute_sha1(scored_abstract), relevance="High"))
+    test_session.add(QueueItem(patent_id="US2", abstract_sha1=compute_sha1(queued_abstract), status="pending"))
+    job = IngestJob(filename="upload.csv", status="pending")
+    test_session.add(job)
+    test_session.commit()
+
+    csv_path = tmp_path / "upload.csv"
+    csv_path.write_text(
+        "Patent ID,Title,Abstract\n"
+        f"US1,Scored,{scored_abstract}\n"
+        f"US2,Queued,{queued_abstract}\n"
+        "US3,New,A gripper arm for lifting unexploded ordnance.\n"
+        "US3,New,A gripper arm for lifting unexploded ordnance.\n",
+        encoding="utf-8",
+    )
+
+    result = process_ingest_job(job.id, str(csv_path))
+
+    assert result["error"] is None
+    assert result["total_parsed"] == 4
+    assert result["existing_scores"] == 1
+    assert result["new_to_score"] == 1
+
+    test_session.expire_all()
+    assert test_session.query(QueueItem).filter_by(patent_id="US3").count() == 1
+    assert test_session.get(IngestJob, job.id).status == "completed"
+
+
+def test_score_many_sends_duplicate_texts_once(monkeypatch):
+    """Test score_many makes one LLM call per distinct uncached text."""
+    from api.services import score as score_module
+    from api.services.score import ScoringService
+
+    monkeypatch.setattr(score_module, "_RESULT_CACHE", score_module.LRUCache(maxsize=100))
+    service = ScoringService.__new__(ScoringService)
+    service.model = "test-model"
+    sent = []
+
+    async def fake_score_many_async(items, prompt_version, concurrency):
+        sent.extend(items)
+        return [("High", ["Perception"], "ok") for _ in items]
+
+    monkeypatch.setattr(service, "_score_many_async", fake_score_many_async)
+    score_module._cache_put(service._result_key("Cached", "C", "v1.0"), ("Low", [], "hit"))
+
+    results = service.score_many([("A", "x"), ("B", "y"), ("A", "x"), ("Cached", "C")])
+
+    assert sent == [("A", "x"), ("B", "y")]
+    assert [r[0] for r in results] == ["High", "High", "High", "Low"]
+
+
+def test_score_chunk_reuses_stored_llm_scores(test_session, monkeypatch):
+    """Test LLM chunks reuse this model's stored scores and ignore legacy labels."""
+    from api import scoring_service
+
+    class FakeService:
+        model = "test-model"
+
+        def __init__(self):
+            self.sent = []
+
+        def score_many(self, items):
+            self.sent.extend(items)
+            return [("High", ["Perception"], "ok") for _ in items]
+
+    service = FakeService()
+    monkeypatch.setattr(scoring_service, "_llm_service", lambda: service)
+
+    abstracts = {pid: f"Abstract {pid}" for pid in ("US1", "US2", "US3")}
+    sha = {pid: compute_abstract_sha1(pid, text) for pid, text in abstracts.items()}
+    # US1 was scored by this model; US2 carries the old label keyword fallbacks used
+    test_session.add(Score(patent_id="US1", abstract_sha1=sha["US1"], relevance="Medium",
+                           subsystem_json='["Mobility"]', model_id="test-model"))
+    test_session.add(Score(patent_id="US2", abstract_sha1=sha["US2"], relevance="Low",
+                           subsystem_json="[]", model_id="llm-scorer"))
+    pending = [
+        QueueItem(patent_id=pid, abstract_sha1=sha[pid], title=pid, abstract=text, status="pending")
+        for pid, text in abstracts.items()
+    ]
+    test_session.add_all(pending)
+    test_session.commit()
+
+    result = scoring_service._score_chunk(test_session, pending, "llm", None, "Low")
+    test_session.commit()
+
+    assert service.sent == [("US2", abstracts["US2"]), ("US3", abstracts["US3"])]
+    assert result["scored"] == 3
+    test_session.expire_all()
+    stored = {s.patent_id: (s.relevance, s.model_id) for s in test_session.query(Score)}
+    assert stored == {
+        "US1": ("Medium", "test-model"),
+        "US2": ("High", "test-model"),
+        "US3": ("High", "test-model"),
+    }
+
+
+def test_sync_to_airtable_skips_known_and_records_created(test_engine, test_session, monkeypatch):
+    """Test sync skips ids in airtable_synced and records the ids it creates."""
+    import asyncio
+    import httpx
+    from api import main
+
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=test_engine))
+    for pid in ("US1", "US2", "US3"):
+        test_session.add(Score(patent_id=pid, abstract_sha1=f"h{pid}", relevance="High", title=pid))
+    test_session.add(Score(patent_id="US4", abstract_sha1="hUS4", relevance="Low"))
+    test_session.add(AirtableSynced(patent_id="US1", airtable_id="recOld"))
+    test_session.commit()
+
+    looked_up, created = [], []
+
+    async def fake_existing(patent_ids):
+        looked_up.extend(patent_ids)
+        return {"US2"}
+
+    async def fake_create(fields_list):
+        created.extend(fields["Patent ID"] for fields in fields_list)
+        records = [{"id": f"rec{fields['Patent ID']}", "fields": fields} for fields in fields_list]
+        return httpx.Response(200, json={"records": records})
+
+    monkeypatch.setattr(main.airtable_service, "existing_patent_ids_async", fake_existing)
+    monkeypatch.setattr(main.airtable_service, "create_records_async", fake_create)
+
+    result = asyncio.run(main.sync_to_airtable(main.SyncRequest(patent_ids=["US1", "US2", "US3", "US4"]), api_key="test"))
+
+    assert sorted(looked_up) == ["US2", "US3"]
+    assert created == ["US3"]
+    assert (result["synced"], result["skipped"], result["errors"]) == (1, 2, 0)
+    test_session.expire_all()
+    synced = {row.patent_id: row.airtable_id for row in test_session.query(AirtableSynced)}
+    assert synced == {"US1": "recOld", "US2": None, "US3": "recUS3"}
+
+
+def test_sync_to_airtable_rechecks_stale_mirror_entries(test_engine, test_session, monkeypatch):
+    """Test mirror entries older than the TTL are looked up again and refreshed."""
+    import asyncio
+    from datetime import timedelta
+    import httpx
+    from api import main
+
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=test_engine))
+    stale = utcnow() - main.AIRTABLE_SYNCED_TTL - timedelta(hours=1)
+    for pid in ("US1", "US2", "US3"):
+        test_session.add(Score(patent_id=pid, abstract_sha1=f"h{pid}", relevance="High", title=pid))
+    # US1's Airtable row was deleted since; US2's still exists; US3 is fresh
+    test_session.add(AirtableSynced(patent_id="US1", airtable_id="recGone", synced_at=stale))
+    test_session.add(AirtableSynced(patent_id="US2", airtable_id="recKept", synced_at=stale))
+    test_session.add(AirtableSynced(patent_id="US3", airtable_id="recFresh"))
+    test_session.commit()
+
+    looked_up, created = [], []
+
+    async def fake_existing(patent_ids):
+        looked_up.extend(patent_ids)
+        return {"US2"}
+
+    async def fake_create(fields_list):
+        created.extend(fields["Patent ID"] for fields in fields_list)
+        records = [{"id": f"rec{fields['Patent ID']}", "fields": fields} for fields in fields_list]
+        return httpx.Response(200, json={"records": records})
+
+    monkeypatch.setattr(main.airtable_service, "existing_patent_ids_async", fake_existing)
+    monkeypatch.setattr(main.airtable_service, "create_records_async", fake_create)
+
+    result = asyncio.run(main.sync_to_airtable(main.SyncRequest(patent_ids=["US1", "US2", "US3"]), api_key="test"))
+
+    assert sorted(looked_up) == ["US1", "US2"]
+    assert created == ["US1"]
+    assert (result["synced"], result["skipped"]) == (1, 2)
+    test_session.expire_all()
+    rows = {row.patent_id: row for row in test_session.query(AirtableSynced)}
+    assert {pid: row.airtable_id for pid, row in rows.items()} == {
+        "US1": "recUS1", "US2": "recKept", "US3": "recFresh",
+    }
+    cutoff = (utcnow() - main.AIRTABLE_SYNCED_TTL).replace(tzinfo=None)
+    assert all(row.synced_at.replace(tzinfo=None) > cutoff for row in rows.values())
+
+
+def test_iter_xml_stream_extracts_records():
+    """Test USPTO XML parsing yields grant and application records."""
+    import io
+    from api.ingest_service import iter_xml_stream
+
+    xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+<us-patent-grants>
+  <us-patent-grant>
+    <us-bibliographic-data-grant>
+      <publication-reference>
+        <document-id><country>US</country><doc-number>11111111</doc-number><kind>B2</kind><date>20230502</date></document-id>
+      </publication-reference>
+      <application-reference>
+        <document-id><country>US</country><doc-number>99999999</doc-number><date>20210101</date></document-id>
+      </application-reference>
+      <invention-title>Mine detection robot</invention-title>
+    </us-bibliographic-data-grant>
+    <abstract><p>First paragraph.</p><p>Second paragraph.</p></abstract>
+    <description><p>Long description text.</p></description>
+  </us-patent-grant>
+  <us-patent-application>
+    <us-bibliographic-data-application>
+      <publication-reference>
+        <document-id><country>US</country><doc-number>20230123456</doc-number><kind>A1</kind><date>20230420</date></document-id>
+      </publication-reference>
+      <invention-title>Tracked chassis</invention-title>
+    </us-bibliographic-data-application>
+    <abstract><p>A tracked chassis for rough terrain.</p></abstract>
+  </us-patent-application>
+  <us-patent-application>
+    <us-bibliographic-data-application>
+      <invention-title>No publication reference</invention-title>
+    </us-bibliographic-data-application>
+    <abstract><p>Skipped.</p></abstract>
+  </us-patent-application>
+</us-patent-grants>
+"""
+    records = list(iter_xml_stream(io.BytesIO(xml)))
+
+    assert records == [
+        {
+            "patent_id": "US11111111B2",
+            "title": "Mine detection robot",
+            "abstract": "First paragraph. Second paragraph.",
+            "pub_date": "20230502",
+            "source": "GRANT",
+        },
+        {
+            "patent_id": "US20230123456A1",
+            "title": "Tracked chassis",
+            "abstract": "A tracked chassis for rough terrain.",
+            "pub_date": "20230420",
+            "source": "IPAB",
+        },
+    ]
+
+
+# === Scorer Tests ===
+
+def test_keyword_score_automaton_matches_str_count(monkeypatch):
+    """Test the Aho-Corasick path counts keywords exactly like str.count."""
+    import scorer
+
+    if not scorer.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+
+    monkeypatch.setattr(scorer, "AHOCORASICK_MIN_KEYWORDS", 1)
+    scorer._build_automaton.cache_clear()
+    mapping = {"Detection": ["detect", "radar", "aa"], "Mobility": ["track", "aa", "wheel"]}
+    text = "Radar tracks detect detection aaa wheeled track"
+
+    prepared = scorer._prepare_mapping(mapping)
+    content = text.lower()
+    assert scorer._build_automaton(prepared) is not None
+    assert scorer._subsystem_counts(content, prepared) == [
+        sum(content.count(k) for k in kws) for _, kws in prepared
+    ]
+    assert scorer.keyword_score(text=text, mapping=mapping) == {
+        "Relevance": "High",
+        "Subsystem": ["Detection", "Mobility"],
+    }
+    scorer._build_automaton.cache_clear()
+
+
+def test_match_keywords_automaton_matches_regex(monkeypatch):
+    """Test the matcher's Aho-Corasick path finds exactly what the fused regexes find."""
+    from api.services import matcher
+
+    if not matcher.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+
+    monkeypatch.setattr(matcher, "AHOCORASICK_MIN_PATTERNS", 1)
+    matcher._build_automaton.cache_clear()
+    keyword_map = {
+        "Detection": ["detect*", "metal detect*", "radar", "gpr"],
+        "Manipulation": ["arm", "dig*", "tool*"],
+        "Control": ["ai", "control*"],
+    }
+    text = "Metal detectors, undetected radar; alarm armored arm-digging tooling paint AI controller_x"
+
+    prepared = tuple((s, tuple(p)) for s, p in keyword_map.items())
+    normalized = matcher.normalize_text(text)
+    assert matcher._build_automaton(prepared) is not None
+    assert matcher._automaton_findall(normalized, prepared, matcher._build_automaton(prepared)) == [
+        matcher._compile_subsystem(patterns).findall(normalized) for _, patterns in prepared
+    ]
+    assert matcher.match_keywords(text, keyword_map) == {
+        "Detection": ["metal detectors", "radar"],
+        "Manipulation": ["arm", "digging", "tooling"],
+        "Control": ["ai", "controller_x"],
+    }
+    matcher._build_automaton.cache_clear()
+
+
 # === API Endpoint Tests ===
 
 def test_api_imports():
@@ -302,6 +615,110 @@ def test_scores_list_schema():
     assert response.page_size == 50
 
 
+def test_etag_response_not_modified():
+    """Test that a matching If-None-Match short-circuits to 304."""
+    from api.main import _etag_response
+    from api.schemas import ListRecordsResponse
+
+    payload = ListRecordsResponse(total=0, offset=0, limit=25, records=[])
+    first = _etag_response(payload, None)
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert _etag_response(payload, etag).status_code == 304
+    assert _etag_response(payload, f'"other", {etag}').status_code == 304
+    assert _etag_response(payload, '"other"').status_code == 200
+
+
+def test_list_scores_cursor_walks_tied_timestamps(test_session):
+    """Test keyset pages over rows sharing scored_at return each row exactly once."""
+    from sqlalchemy import text
+    from api.main import list_scores
+
+    stamp = utcnow()
+    for i in range(5):
+        test_session.add(Score(patent_id=f"US{i}", abstract_sha1=f"h{i}", relevance="High", scored_at=stamp))
+    test_session.commit()
+
+    first = list_scores(page_size=2, db=test_session, api_key="test")
+    seen = [item.patent_id for item in first.items]
+    cursor = first.next_cursor
+    # Cursors already handed out must survive VACUUM renumbering rowids
+    test_session.execute(text("UPDATE scores SET rowid = 10 - rowid"))
+    test_session.commit()
+    while cursor:
+        page = list_scores(page_size=2, cursor=cursor, skip_total=True, db=test_session, api_key="test")
+        assert page.total is None
+        seen += [item.patent_id for item in page.items]
+        cursor = page.next_cursor
+
+    assert first.total == 5
+    assert seen == ["US4", "US3", "US2", "US1", "US0"]
+
+
+def test_get_queue_cursor_walks_tied_timestamps(test_session):
+    """Test keyset pages over queue items sharing enqueued_at return each item once."""
+    from api.main import get_queue
+
+    stamp = utcnow()
+    for i in range(5):
+        test_session.add(QueueItem(patent_id=f"US{i}", abstract_sha1=f"h{i}", status="pending", enqueued_at=stamp))
+    test_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = get_queue(page_size=2, status="pending", cursor=cursor, db=test_session, api_key="test")
+        seen += [item.patent_id for item in page.items]
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    assert seen == ["US4", "US3", "US2", "US1", "US0"]
+    assert get_queue(page_size=2, skip_total=True, db=test_session, api_key="test").total is None
+
+
+def test_list_cursor_malformed_is_400(test_session):
+    """Test a cursor that doesn't decode is rejected as a client error."""
+    from fastapi import HTTPException
+    from api.main import get_queue, list_scores
+
+    for cursor in ("!!", "bm90LWEtY3Vyc29y", "NQ==", "WzEsMiwzXQ=="):
+        with pytest.raises(HTTPException) as exc:
+            list_scores(cursor=cursor, db=test_session, api_key="test")
+        assert exc.value.status_code == 400
+        with pytest.raises(HTTPException) as exc:
+            get_queue(cursor=cursor, db=test_session, api_key="test")
+        assert exc.value.status_code == 400
+
+
+def test_score_search_survives_rowid_renumbering(test_engine, test_session):
+    """Test FTS search follows search_id, so renumbered rowids (as VACUUM may do) don't mismatch."""
+    from api.main import list_scores
+    from api.models import SCORES_FTS_DDL
+
+    with test_engine.begin() as conn:
+        for ddl in SCORES_FTS_DDL:
+            conn.exec_driver_sql(ddl)
+    for i in range(4):
+        abstract = "A gripper arm" if i % 2 else "A mine clearing flail"
+        test_session.add(Score(patent_id=f"US{i}", abstract_sha1=f"h{i}", relevance="High", abstract=abstract))
+    test_session.commit()
+
+    # VACUUM rewrites rows without firing triggers; shuffle rowids the same way
+    with test_engine.begin() as conn:
+        triggers = conn.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type='trigger' AND tbl_name='scores'"
+        ).all()
+        for name, _ in triggers:
+            conn.exec_driver_sql(f"DROP TRIGGER {name}")
+        conn.exec_driver_sql("UPDATE scores SET rowid = 10 - rowid")
+        for _, sql in triggers:
+            conn.exec_driver_sql(sql)
+
+    page = list_scores(search="gripper", db=test_session, api_key="test")
+    assert sorted(item.patent_id for item in page.items) == ["US1", "US3"]
+
+
 # === Integration Test ===
 
 def test_full_workflow(test_session):